@@ -0,0 +1,31 @@
+import threading
+
+# -----------------------------
+# In-process graph versions
+# -----------------------------
+# Bumped by the KG loader whenever it writes to a Neo4j database; read-side
+# caches (schema snapshots, query results) compare against it to know when
+# their entries are stale.
+
+_versions = {}
+_lock = threading.Lock()
+
+
+def graph_key(uri: str, database: str | None) -> tuple:
+    uri = (uri or "").strip().rstrip("/").lower()
+    # bolt://, neo4j:// and their +s variants all reach the same server
+    if "://" in uri:
+        uri = uri.split("://", 1)[1]
+    return uri, (database or "neo4j").lower()
+
+
+def current_version(uri: str, database: str | None) -> int:
+    with _lock:
+        return _versions.get(graph_key(uri, database), 0)
+
+
+def bump_version(uri: str, database: str | None) -> int:
+    key = graph_key(uri, database)
+    with _lock:
+        _versions[key] = _versions.get(key, 0) + 1
+        return _versions[key]
@@ -0,0 +1,243 @@
+import asyncio
+import importlib.util
+import os
+import random
+import threading
+import time
+import weakref
+
+import httpx
+from groq import AsyncGroq, Groq
+from groq import APIConnectionError, APIStatusError, APITimeoutError
+
+# -----------------------------
+# Defaults (override via .env)
+# -----------------------------
+DEFAULT_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+GROQ_RPM = int(os.getenv("GROQ_RPM", "30"))          # requests / minute, 0 = unlimited
+GROQ_TPM = int(os.getenv("GROQ_TPM", "12000"))       # tokens / minute, 0 = unlimited
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "5"))
+GROQ_TIMEOUT = float(os.getenv("GROQ_TIMEOUT", "60"))
+GROQ_MAX_CONNECTIONS = int(os.getenv("GROQ_MAX_CONNECTIONS", "50"))
+
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 20.0
+DEFAULT_COMPLETION_TOKENS = 256
+
+# HTTP/2 needs the optional `h2` package; fall back to HTTP/1.1 keep-alive
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+
+# -----------------------------
+# Rate limiting
+# -----------------------------
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at `per_minute` / 60 per
+    second. reserve() never blocks; it books the tokens (the balance may go
+    negative) and returns how long the caller has to wait, so the same
+    bucket serves sync (time.sleep) and async (asyncio.sleep) callers.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        if self.capacity <= 0:
+            return 0.0
+
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+def _estimate_tokens(messages, max_tokens) -> int:
+    chars = sum(len(str(m.get("content", ""))) for m in messages)
+    return chars // 4 + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+def _retryable(e: Exception) -> bool:
+    if isinstance(e, (APIConnectionError, APITimeoutError)):
+        return True
+    if isinstance(e, APIStatusError):
+        return e.status_code == 429 or e.status_code >= 500
+    return False
+
+
+def _backoff(attempt: int, e: Exception) -> float:
+    retry_after = None
+    response = getattr(e, "response", None)
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_MAX)
+        except ValueError:
+            pass
+    delay = min(BACKOFF_BASE * (2 ** attempt), BACKOFF_MAX)
+    return delay * (0.5 + random.random() / 2)
+
+
+# -----------------------------
+# Gateway
+# -----------------------------
+class LLMGateway:
+    """
+    One pooled, rate-limited Groq client per API key, shared by Kg, nlp and
+    nlp_rag. Keeps TLS connections alive across requests, spaces calls
+    against Groq's RPM / TPM limits and retries 429 / 5xx with backoff.
+    """
+
+    def __init__(self, api_key: str, rpm: int = GROQ_RPM, tpm: int = GROQ_TPM,
+                 max_retries: int = GROQ_MAX_RETRIES):
+        self.api_key = api_key
+        self.max_retries = max_retries
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+
+        self.http_client = httpx.Client(
+            http2=HTTP2,
+            timeout=GROQ_TIMEOUT,
+            limits=self._limits(),
+        )
+        # retries are handled here, with the rate limiter in the loop
+        self.client = Groq(api_key=api_key, http_client=self.http_client, max_retries=0)
+
+        # httpx async clients are bound to the event loop that created them
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._async_lock = threading.Lock()
+
+    @staticmethod
+    def _limits():
+        return httpx.Limits(
+            max_connections=GROQ_MAX_CONNECTIONS,
+            max_keepalive_connections=GROQ_MAX_CONNECTIONS,
+            keepalive_expiry=120,
+        )
+
+    def async_client(self) -> AsyncGroq:
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                http_client = httpx.AsyncClient(
+                    http2=HTTP2,
+                    timeout=GROQ_TIMEOUT,
+                    limits=self._limits(),
+                )
+                client = AsyncGroq(api_key=self.api_key, http_client=http_client, max_retries=0)
+                self._async_clients[loop] = client
+            return client
+
+    async def aclose(self):
+        """
+        Closes the async client of the running loop; call it before a
+        short-lived loop (asyncio.run) ends.
+        """
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            client = self._async_clients.pop(loop, None)
+        if client is not None:
+            await client.close()
+
+    def _wait_time(self, messages, max_tokens) -> float:
+        return max(
+            self.requests.reserve(1),
+            self.tokens.reserve(_estimate_tokens(messages, max_tokens)),
+        )
+
+    @staticmethod
+    def _messages(prompt=None, messages=None):
+        if messages is not None:
+            return messages
+        return [{"role": "user", "content": prompt}]
+
+    @staticmethod
+    def _extra(max_tokens, kwargs):
+        if max_tokens is not None:
+            return {"max_tokens": max_tokens, **kwargs}
+        return kwargs
+
+    # ---------- sync ----------
+
+    def complete(self, prompt=None, messages=None, model=DEFAULT_MODEL,
+                 temperature=0, max_tokens=None, **kwargs):
+        """
+        Raw chat completion (use for streaming or response_format).
+        """
+        messages = self._messages(prompt, messages)
+
+        for attempt in range(self.max_retries + 1):
+            time.sleep(self._wait_time(messages, max_tokens))
+            try:
+                return self.client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    **self._extra(max_tokens, kwargs),
+                )
+            except Exception as e:
+                if attempt >= self.max_retries or not _retryable(e):
+                    raise
+                time.sleep(_backoff(attempt, e))
+
+    def chat(self, prompt=None, messages=None, model=DEFAULT_MODEL,
+             temperature=0, max_tokens=None, **kwargs) -> str:
+        resp = self.complete(prompt, messages, model, temperature, max_tokens, **kwargs)
+        return resp.choices[0].message.content
+
+    # ---------- async ----------
+
+    async def acomplete(self, prompt=None, messages=None, model=DEFAULT_MODEL,
+                        temperature=0, max_tokens=None, **kwargs):
+        messages = self._messages(prompt, messages)
+        client = self.async_client()
+
+        for attempt in range(self.max_retries + 1):
+            await asyncio.sleep(self._wait_time(messages, max_tokens))
+            try:
+                return await client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    **self._extra(max_tokens, kwargs),
+                )
+            except Exception as e:
+                if attempt >= self.max_retries or not _retryable(e):
+                    raise
+                await asyncio.sleep(_backoff(attempt, e))
+
+    async def achat(self, prompt=None, messages=None, model=DEFAULT_MODEL,
+                    temperature=0, max_tokens=None, **kwargs) -> str:
+        resp = await self.acomplete(prompt, messages, model, temperature, max_tokens, **kwargs)
+        return resp.choices[0].message.content
+
+
+# -----------------------------
+# Process-wide registry
+# -----------------------------
+_gateways = {}
+_gateways_lock = threading.Lock()
+
+
+def get_gateway(api_key: str | None = None) -> LLMGateway:
+    api_key = api_key or os.getenv("GROQ_API_KEY")
+    if not api_key:
+        raise ValueError("GROQ_API_KEY missing in .env")
+
+    with _gateways_lock:
+        gateway = _gateways.get(api_key)
+        if gateway is None:
+            gateway = LLMGateway(api_key)
+            _gateways[api_key] = gateway
+        return gateway
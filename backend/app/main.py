@@ -25,3 +25,8 @@ async def lazy_load_routers(request: Request, call_next):
 @app.get("/")
 def health():
     return {"status": "ok"}
+
+@app.on_event("shutdown")
+async def close_neo4j_drivers():
+    from app.neo4j_pool import aclose_all
+    await aclose_all()
@@ -0,0 +1,26 @@
+from itertools import islice
+
+# -----------------------------
+# Defaults
+# -----------------------------
+DEFAULT_BATCH_SIZE = 10000
+MIN_BATCH_SIZE = 1
+MAX_BATCH_SIZE = 50000
+
+
+def chunked(iterable, size: int):
+    """
+    Yield lists of at most `size` items from any iterable (lists, generators).
+    """
+    it = iter(iterable)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def rate(count: int, seconds: float) -> float:
+    if seconds <= 0:
+        return float(count)
+    return round(count / seconds, 2)
@@ -0,0 +1,430 @@
+"""
+Offline bulk import: Postgres COPY -> CSV -> neo4j-admin database import.
+
+For initial loads of large schemas. Every table is streamed out with
+COPY ... TO STDOUT (FORMAT csv) straight into a data file, next to a
+header file in the format `neo4j-admin database import full` expects; the
+importer then builds the store of a stopped database in one pass.
+
+Labels, property and relationship names come from the semantic cache, so
+the graph is named exactly like one loaded over Bolt. Differences:
+- every table gets its own ID space, so two tables the LLM gave the same
+  label stay separate nodes;
+- FKs that do not reference the parent's primary key are skipped;
+- array columns are stored as their Postgres text form.
+
+    python -m app.modules.Kg.bulk_import --pg-database employee \\
+        --pg-user postgres --pg-password ... --neo4j-password ...
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import time
+from pathlib import Path
+
+from app.graph_version import bump_version
+from app.modules.Kg.batching import rate
+from app.modules.Kg.index_manager import build_key_specs, ensure_key_indexes
+from app.modules.Kg.pg_reader import RSSSampler, _quote
+from app.modules.Kg.semantic_router import namespace_for, prefetch_names, set_llm_usage
+from app.modules.Kg.service import (
+    ROW_LIMIT_DEFAULT,
+    USE_LLM_DEFAULT,
+    _run_pool,
+    build_edge_plans,
+    build_table_plans,
+    connect_postgres,
+    extract_schema_from_postgres,
+    primary_key_column,
+)
+from app.modules.Kg.watermarks import clear_watermarks, source_key
+from app.neo4j_pool import lease_driver
+
+# -----------------------------
+# Defaults (override via .env)
+# -----------------------------
+IMPORT_DIR = Path(os.getenv("KG_IMPORT_DIR", "artifacts/kg/import"))
+NEO4J_ADMIN = os.getenv("NEO4J_ADMIN", "neo4j-admin")
+COPY_BUFFER_BYTES = 1024 * 1024
+
+# Postgres type (format_type) -> neo4j-admin header type + SELECT expression
+_TEMPORAL_SQL = {
+    "timestamp without time zone": "to_char({c}, 'YYYY-MM-DD\"T\"HH24:MI:SS.US')",
+    "timestamp with time zone": "to_char({c} AT TIME ZONE 'UTC', 'YYYY-MM-DD\"T\"HH24:MI:SS.US\"Z\"')",
+}
+
+_IMPORT_TYPES = {
+    "smallint": "long",
+    "integer": "long",
+    "bigint": "long",
+    "numeric": "double",
+    "real": "double",
+    "double precision": "double",
+    "money": "string",
+    "boolean": "boolean",
+    "date": "date",
+    "time without time zone": "localtime",
+    "timestamp without time zone": "localdatetime",
+    "timestamp with time zone": "datetime",
+}
+
+
+def import_type(datatype: str) -> str:
+    if (datatype or "").endswith("[]"):
+        return "string"
+    return _IMPORT_TYPES.get(datatype, "string")
+
+
+def column_sql(name: str, datatype: str) -> str:
+    col = _quote(name)
+    if datatype in _TEMPORAL_SQL:
+        return _TEMPORAL_SQL[datatype].format(c=col)
+    if datatype == "boolean":
+        return f"{col}::text"   # 'true' / 'false' rather than t / f
+    return col
+
+
+# -----------------------------
+# CSV export
+# -----------------------------
+def _write_header(path: Path, fields):
+    path.write_text(",".join(fields) + "\n", encoding="utf-8")
+
+
+def _copy_to_file(pg, sql: str, path: Path) -> int:
+    """
+    Streams COPY (sql) TO STDOUT into `path`; returns the row count.
+    """
+    with pg.cursor() as cur, open(path, "w", encoding="utf-8", newline="",
+                                  buffering=COPY_BUFFER_BYTES) as f:
+        cur.execute("SET DateStyle TO ISO")
+        cur.copy_expert(f"COPY ({sql}) TO STDOUT WITH (FORMAT csv)", f)
+        return cur.rowcount
+
+
+def export_table_nodes(pg_cfg, table, plan, out_dir: Path, row_limit=None, progress=None):
+    fields = [f":ID({table['table']})"]
+    selects = [_quote(plan["pk_col_name"])]
+    seen_props = set()
+
+    for col in table["columns"]:
+        prop = plan["prop_by_col"].get(col["name"].lower(), col["name"])
+        if prop in seen_props:
+            continue
+        seen_props.add(prop)
+        fields.append(f"{prop}:{import_type(col['datatype'])}")
+        selects.append(column_sql(col["name"], col["datatype"]))
+
+    sql = f"SELECT {', '.join(selects)} FROM {_quote(pg_cfg.schema_name)}.{_quote(table['table'])}"
+    if row_limit:
+        sql += f" LIMIT {int(row_limit)}"
+
+    header = out_dir / f"nodes_{table['table']}_header.csv"
+    data = out_dir / f"nodes_{table['table']}.csv"
+    _write_header(header, fields)
+
+    started = time.perf_counter()
+    pg = connect_postgres(pg_cfg)
+    try:
+        rows = _copy_to_file(pg, sql, data)
+    finally:
+        pg.close()
+    seconds = time.perf_counter() - started
+
+    if progress:
+        progress.rows_written(rows)
+        progress.table_done()
+
+    size = data.stat().st_size
+    return {
+        "table": table["table"],
+        "label": plan["label"],
+        "rows": rows,
+        "bytes": size,
+        "seconds": round(seconds, 3),
+        "rows_per_sec": rate(rows, seconds),
+        "header": str(header),
+        "data": str(data),
+    }
+
+
+def export_edge(pg_cfg, edge, out_dir: Path, progress=None):
+    name = f"rels_{edge['table']}_{edge['fk_column']}".lower()
+    header = out_dir / f"{name}_header.csv"
+    data = out_dir / f"{name}.csv"
+    _write_header(header, [f":START_ID({edge['table']})", f":END_ID({edge['parent_table']})"])
+
+    fk = _quote(edge["fk_column"])
+    sql = (
+        f"SELECT {_quote(edge['child_pk_col_name'])}, {fk} "
+        f"FROM {_quote(pg_cfg.schema_name)}.{_quote(edge['table'])} "
+        f"WHERE {fk} IS NOT NULL"
+    )
+
+    started = time.perf_counter()
+    pg = connect_postgres(pg_cfg)
+    try:
+        rows = _copy_to_file(pg, sql, data)
+    finally:
+        pg.close()
+    seconds = time.perf_counter() - started
+
+    if progress:
+        progress.relationships_written(rows)
+
+    return {
+        "relationship": edge["relationship"],
+        "table": edge["table"],
+        "fk_column": edge["fk_column"].lower(),
+        "pairs": rows,
+        "bytes": data.stat().st_size,
+        "seconds": round(seconds, 3),
+        "header": str(header),
+        "data": str(data),
+    }
+
+
+# -----------------------------
+# neo4j-admin
+# -----------------------------
+def importer_command(kg_db: str, node_files, rel_files, report_file: Path) -> list:
+    cmd = [
+        NEO4J_ADMIN, "database", "import", "full", kg_db,
+        "--overwrite-destination=true",
+        "--multiline-fields=true",
+        "--skip-bad-relationships=true",
+        "--skip-duplicate-nodes=true",   # composite keys use their first column
+        f"--report-file={report_file}",
+    ]
+    cmd += [f"--nodes={n['label']}={n['header']},{n['data']}" for n in node_files]
+    cmd += [f"--relationships={r['relationship']}={r['header']},{r['data']}" for r in rel_files]
+    return cmd
+
+
+def run_importer(cmd: list) -> float:
+    if shutil.which(cmd[0]) is None:
+        raise RuntimeError(f"{cmd[0]} not found; set NEO4J_ADMIN to the neo4j-admin binary")
+
+    started = time.perf_counter()
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    seconds = time.perf_counter() - started
+
+    if proc.returncode != 0:
+        tail = (proc.stderr or proc.stdout or "")[-2000:]
+        raise RuntimeError(f"neo4j-admin import failed ({proc.returncode}): {tail}")
+    return seconds
+
+
+def _system_command(driver, query: str) -> bool:
+    try:
+        with driver.session(database="system") as session:
+            session.run(query).consume()
+        return True
+    except Exception as e:
+        print(f"[KG] {query} failed: {e}")
+        return False
+
+
+# -----------------------------
+# MAIN (bulk)
+# -----------------------------
+def bulk_import_kg(payload, progress=None, run_import: bool = True):
+    """
+    /kg/load with load_method="admin_import". The target database is
+    stopped (when the server allows it), rebuilt by neo4j-admin and started
+    again; on Community Edition stop the server first and start it after.
+    """
+    set_llm_usage(USE_LLM_DEFAULT)
+    if USE_LLM_DEFAULT and not os.getenv("GROQ_API_KEY"):
+        raise ValueError("GROQ_API_KEY missing in .env")
+
+    max_workers = getattr(payload, "max_workers", None) or 1
+    schema = payload.pg.schema_name
+    kg_db = f"kg_{payload.pg.database}"
+
+    if progress:
+        progress.set_phase("schema")
+
+    pg = connect_postgres(payload.pg)
+    try:
+        with pg.cursor() as cur:
+            schema_data = extract_schema_from_postgres(cur, schema)
+    finally:
+        pg.close()
+
+    pk_by_table = {t["table"]: primary_key_column(t, schema) for t in schema_data}
+    tables_by_name = {t["table"]: t for t in schema_data}
+
+    if progress:
+        progress.set_phase("naming")
+
+    ns = namespace_for(payload.pg.database, schema)
+    naming_stats = prefetch_names(schema_data, ns=ns)
+    plans = build_table_plans(schema_data, pk_by_table, ns=ns)
+    edges_by_rel = build_edge_plans(schema_data, plans, ns=ns)
+
+    edges, skipped = [], []
+    for rel_edges in edges_by_rel.values():
+        for edge in rel_edges:
+            parent_table = edge["parent_table"]
+            parent_column = edge["parent_column"]
+            if parent_column.lower() != pk_by_table[parent_table]:
+                skipped.append({"table": edge["table"], "fk_column": edge["fk_column"]})
+                continue
+            edges.append(edge)
+
+    if progress:
+        progress.plan(len(plans), len(edges_by_rel))
+        progress.set_phase("export")
+
+    out_dir = IMPORT_DIR / kg_db
+    shutil.rmtree(out_dir, ignore_errors=True)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    export_started = time.perf_counter()
+    with RSSSampler() as rss:
+        node_files = _run_pool(
+            export_table_nodes,
+            [
+                (payload.pg, tables_by_name[name], plan, out_dir, ROW_LIMIT_DEFAULT, progress)
+                for name, plan in plans.items()
+            ],
+            max_workers,
+        )
+        rel_files = _run_pool(
+            export_edge,
+            [(payload.pg, edge, out_dir, progress) for edge in edges],
+            max_workers,
+        )
+    export_seconds = time.perf_counter() - export_started
+
+    rows = sum(n["rows"] for n in node_files)
+    pairs = sum(r["pairs"] for r in rel_files)
+    bytes_written = sum(n["bytes"] for n in node_files) + sum(r["bytes"] for r in rel_files)
+
+    report_file = out_dir / "import.report"
+    cmd = importer_command(kg_db, node_files, rel_files, report_file)
+    (out_dir / "import_command.json").write_text(json.dumps(cmd, indent=2), encoding="utf-8")
+
+    result = {
+        "status": "exported",
+        "load_method": "admin_import",
+        "neo4j_database": kg_db,
+        "import_dir": str(out_dir),
+        "import_command": cmd,
+        "tables_loaded": len(node_files),
+        "rows_exported": rows,
+        "relationship_pairs_exported": pairs,
+        "skipped_edges": skipped,
+        "naming": naming_stats,
+        "bytes_written": bytes_written,
+        "export_seconds": round(export_seconds, 3),
+        "export_mb_per_sec": rate(bytes_written / (1024 * 1024), export_seconds),
+        "export_rows_per_sec": rate(rows + pairs, export_seconds),
+        "peak_rss_mb": rss.peak_mb,      # during the export
+        "tables": node_files,
+        "relationship_files": rel_files,
+    }
+    if not run_import:
+        return result
+
+    # -----------------------------
+    # Import into the stopped database
+    # -----------------------------
+    if progress:
+        progress.set_phase("import")
+
+    neo4j_lease = None
+    try:
+        try:
+            neo4j_lease = lease_driver(
+                payload.neo4j.uri, payload.neo4j.user, payload.neo4j.password, kg_db
+            )
+        except Exception as e:
+            print(f"[KG] Neo4j not reachable, assuming it is stopped: {e}")
+
+        if neo4j_lease:
+            _system_command(neo4j_lease.driver, f"STOP DATABASE `{kg_db}`")
+
+        import_seconds = run_importer(cmd)
+
+        started = False
+        index_stats = {"indexes": [], "seconds": 0.0}
+        if neo4j_lease:
+            _system_command(neo4j_lease.driver, f"CREATE DATABASE `{kg_db}` IF NOT EXISTS")
+            started = _system_command(neo4j_lease.driver, f"START DATABASE `{kg_db}` WAIT")
+            if started:
+                node_keys = [(p["table"], p["label"], p["pk_prop"]) for p in plans.values()]
+                index_stats = ensure_key_indexes(
+                    neo4j_lease.driver, kg_db, build_key_specs(node_keys)
+                )
+
+        # the store was rebuilt from scratch: previous deltas are meaningless
+        clear_watermarks(source_key(payload.pg, kg_db))
+    finally:
+        if neo4j_lease:
+            neo4j_lease.close()
+        bump_version(payload.neo4j.uri, kg_db)
+
+    result.update({
+        "status": "success",
+        "database_started": started,
+        "import_seconds": round(import_seconds, 3),
+        "import_rows_per_sec": rate(rows + pairs, import_seconds),
+        "import_mb_per_sec": rate(bytes_written / (1024 * 1024), import_seconds),
+        "index_seconds": index_stats["seconds"],
+        "indexes": index_stats["indexes"],
+        "report_file": str(report_file),
+    })
+    return result
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main():
+    from app.modules.Kg.schemas import KGLoadRequest
+
+    parser = argparse.ArgumentParser(description="Bulk-import a Postgres schema with neo4j-admin")
+    parser.add_argument("--pg-host", default="localhost")
+    parser.add_argument("--pg-port", type=int, default=5432)
+    parser.add_argument("--pg-database", required=True)
+    parser.add_argument("--pg-user", default="postgres")
+    parser.add_argument("--pg-password", required=True)
+    parser.add_argument("--pg-schema", default="public")
+    parser.add_argument("--neo4j-uri", default="bolt://localhost:7687")
+    parser.add_argument("--neo4j-user", default="neo4j")
+    parser.add_argument("--neo4j-password", default="")
+    parser.add_argument("--max-workers", type=int, default=4)
+    parser.add_argument("--export-only", action="store_true",
+                        help="write the CSV files and the importer command, do not import")
+    args = parser.parse_args()
+
+    payload = KGLoadRequest(
+        pg={
+            "host": args.pg_host,
+            "port": args.pg_port,
+            "database": args.pg_database,
+            "username": args.pg_user,
+            "password": args.pg_password,
+            "schema_name": args.pg_schema,
+        },
+        neo4j={
+            "uri": args.neo4j_uri,
+            "user": args.neo4j_user,
+            "password": args.neo4j_password,
+        },
+        max_workers=args.max_workers,
+        load_method="admin_import",
+    )
+
+    result = bulk_import_kg(payload, run_import=not args.export_only)
+    summary = {k: v for k, v in result.items() if k not in ("tables", "relationship_files")}
+    print(json.dumps(summary, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import re
+import time
+
+INDEX_WAIT_SECONDS = 600
+
+
+def _name(kind: str, label: str, prop: str) -> str:
+    raw = f"kg_{label}_{prop}_{kind}".lower()
+    return re.sub(r"[^a-z0-9_]", "_", raw)
+
+
+def build_key_specs(keys, lookup_keys=()):
+    """
+    keys: iterable of (table, label, property) for every node primary key.
+    lookup_keys: iterable of (label, property) matched by relationships
+    (FK targets) that are not primary keys; these only get a range index.
+
+    A label/property pair gets a UNIQUE constraint only when exactly one
+    source table maps onto it; if several tables share a label (the LLM may
+    name two tables the same) uniqueness is not guaranteed and a range
+    index is used instead.
+    """
+    tables_by_key = {}
+    for table, label, prop in keys:
+        tables_by_key.setdefault((label, prop), set()).add(table)
+
+    specs = [
+        {
+            "label": label,
+            "property": prop,
+            "unique": len(tables) == 1,
+            "tables": sorted(tables),
+        }
+        for (label, prop), tables in tables_by_key.items()
+    ]
+
+    for label, prop in sorted(set(lookup_keys)):
+        if (label, prop) not in tables_by_key:
+            specs.append({
+                "label": label,
+                "property": prop,
+                "unique": False,
+                "tables": [],
+            })
+
+    return specs
+
+
+def ensure_key_indexes(driver, database, specs):
+    """
+    Creates a uniqueness constraint (or range index) per spec before any node
+    is written, then waits for them to come online so MERGE / MATCH on the
+    key never falls back to a label scan.
+    """
+    started = time.perf_counter()
+    created = []
+
+    with driver.session(database=database) as session:
+        for spec in specs:
+            label = spec["label"]
+            prop = spec["property"]
+
+            if spec.get("unique"):
+                try:
+                    # ✅ ALWAYS USE BACKTICKS
+                    session.run(
+                        f"""
+                        CREATE CONSTRAINT {_name("unique", label, prop)} IF NOT EXISTS
+                        FOR (n:`{label}`) REQUIRE n.`{prop}` IS UNIQUE
+                        """
+                    ).consume()
+                    created.append({**spec, "kind": "unique_constraint"})
+                    continue
+                except Exception as e:
+                    # e.g. existing duplicate values -> fall back to an index
+                    print(f"[KG] Unique constraint failed for {label}.{prop}: {e}")
+
+            session.run(
+                f"""
+                CREATE INDEX {_name("index", label, prop)} IF NOT EXISTS
+                FOR (n:`{label}`) ON (n.`{prop}`)
+                """
+            ).consume()
+            created.append({**spec, "kind": "range_index"})
+
+        session.run(f"CALL db.awaitIndexes({INDEX_WAIT_SECONDS})").consume()
+
+    return {
+        "indexes": created,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
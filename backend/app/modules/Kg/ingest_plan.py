@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+# --------------------------------------------------
+# Artifact directory
+# --------------------------------------------------
+PLAN_DIR = Path("artifacts/kg/plans")
+PLAN_VERSION = 2   # 2: plans carry original-case pk_col_name / child_pk_col_name
+
+# -----------------------------
+# Defaults (override via .env)
+# -----------------------------
+# used by the dry-run estimate until a load of this source has been measured
+ESTIMATE_ROWS_PER_SEC = float(os.getenv("KG_ESTIMATE_ROWS_PER_SEC", "20000"))
+ESTIMATE_RELATIONSHIPS_PER_SEC = float(os.getenv("KG_ESTIMATE_RELATIONSHIPS_PER_SEC", "10000"))
+
+_lock = threading.Lock()
+
+
+# -----------------------------
+# Schema fingerprint (one catalog query)
+# -----------------------------
+def schema_fingerprint(cur, schema: str) -> str:
+    """
+    md5 over every column (name, position, type) and every PK / FK
+    definition of `schema`, computed server-side. Any change that could
+    alter the plan changes the fingerprint, including SELECT grants, since
+    extract_schema_from_postgres only sees readable tables.
+    """
+    cur.execute("""
+        SELECT md5(coalesce(string_agg(line, E'\\n' ORDER BY line), ''))
+        FROM (
+            SELECT 'c|' || c.relname || '|' || coalesce(a.attnum::text, '') || '|'
+                   || coalesce(a.attname, '') || '|'
+                   || coalesce(format_type(a.atttypid, NULL), '') AS line
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            LEFT JOIN pg_attribute a
+              ON a.attrelid = c.oid
+             AND a.attnum > 0
+             AND NOT a.attisdropped
+            WHERE n.nspname = %s
+              AND c.relkind IN ('r', 'p')
+              AND NOT c.relispartition
+              AND has_table_privilege(c.oid, 'SELECT')
+
+            UNION ALL
+
+            SELECT 'k|' || c.relname || '|' || con.conname || '|' || pg_get_constraintdef(con.oid)
+            FROM pg_constraint con
+            JOIN pg_class c ON c.oid = con.conrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = %s
+              AND con.contype IN ('p', 'f')
+              AND has_table_privilege(c.oid, 'SELECT')
+              AND (con.confrelid = 0 OR has_table_privilege(con.confrelid, 'SELECT'))
+        ) s
+    """, (schema, schema))
+    return cur.fetchone()[0]
+
+
+# -----------------------------
+# Storage (one JSON file per source)
+# -----------------------------
+def plan_key(pg_cfg) -> str:
+    return f"{pg_cfg.host}:{pg_cfg.port}/{pg_cfg.database}/{pg_cfg.schema_name}"
+
+
+def plan_path(pg_cfg) -> Path:
+    digest = hashlib.sha1(plan_key(pg_cfg).encode("utf-8")).hexdigest()[:12]
+    return PLAN_DIR / f"{pg_cfg.database}.{pg_cfg.schema_name}.{digest}.json"
+
+
+def _read(path: Path):
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
+
+def _write(path: Path, plan: dict):
+    PLAN_DIR.mkdir(parents=True, exist_ok=True)
+    # atomic replace so a crash never leaves a half-written file
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(plan, indent=2, default=str), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def load_plan(pg_cfg, fingerprint: str, use_llm: bool):
+    """
+    The stored plan of this source, or None when there is none or it was
+    built for another schema fingerprint / naming mode.
+    """
+    with _lock:
+        plan = _read(plan_path(pg_cfg))
+    if not plan:
+        return None
+    if (plan.get("version") != PLAN_VERSION
+            or plan.get("key") != plan_key(pg_cfg)
+            or plan.get("fingerprint") != fingerprint
+            or plan.get("use_llm") != use_llm):
+        return None
+    return plan
+
+
+def save_plan(pg_cfg, plan: dict):
+    with _lock:
+        _write(plan_path(pg_cfg), plan)
+
+
+def record_throughput(pg_cfg, fingerprint: str, measured: dict):
+    """
+    Stores the rates of a finished load in its plan, for later estimates.
+    """
+    with _lock:
+        path = plan_path(pg_cfg)
+        plan = _read(path)
+        if not plan or plan.get("fingerprint") != fingerprint:
+            return
+        plan["last_load"] = {**measured, "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        _write(path, plan)
+
+
+def discard_plans(namespace: str) -> int:
+    """
+    Deletes every stored plan of a semantic namespace ("database/schema");
+    their names came from the cache entries being invalidated.
+    """
+    removed = 0
+    with _lock:
+        if not PLAN_DIR.exists():
+            return 0
+        for path in PLAN_DIR.glob("*.json"):
+            plan = _read(path)
+            if plan and plan.get("namespace") == namespace:
+                path.unlink(missing_ok=True)
+                removed += 1
+    return removed
+
+
+# -----------------------------
+# Dry-run estimate (planner statistics only)
+# -----------------------------
+def estimate_fk_fill(cur, schema: str) -> dict:
+    """
+    {(table, column): fraction of non-NULL values} from pg_stats; columns
+    never analysed are missing (treated as fully populated).
+    """
+    cur.execute("""
+        SELECT tablename, attname, null_frac
+        FROM pg_stats
+        WHERE schemaname = %s
+    """, (schema,))
+    return {(t, c.lower()): 1.0 - float(f) for t, c, f in cur.fetchall()}
+
+
+def estimate_load(plan: dict, row_estimates: dict, fk_fill: dict, max_workers: int = 1) -> dict:
+    """
+    Rows and relationships expected from pg_class.reltuples / pg_stats and
+    the predicted load time, using the rates of the last measured load of
+    this source (or the KG_ESTIMATE_* defaults).
+    """
+    tables = {
+        name: row_estimates.get(name, 0)
+        for name in plan["tables"]
+    }
+    relationships = []
+    for rel_type, edges in plan["relationships"].items():
+        for edge in edges:
+            child_rows = tables.get(edge["table"], 0)
+            fill = fk_fill.get((edge["table"], edge["fk_column"].lower()), 1.0)
+            relationships.append({
+                "relationship": rel_type,
+                "table": edge["table"],
+                "fk_column": edge["fk_column"],
+                "estimated": int(child_rows * fill),
+            })
+
+    rows = sum(tables.values())
+    rels = sum(r["estimated"] for r in relationships)
+
+    last = plan.get("last_load") or {}
+    rows_per_sec = last.get("rows_per_sec") or ESTIMATE_ROWS_PER_SEC
+    rels_per_sec = last.get("relationships_per_sec") or ESTIMATE_RELATIONSHIPS_PER_SEC
+    if not last:
+        # defaults are per worker; measured rates already include parallelism
+        rows_per_sec *= max(1, min(max_workers, len(tables)))
+        rels_per_sec *= max(1, max_workers)   # parent-key partitions per edge
+
+    nodes_seconds = rows / rows_per_sec if rows_per_sec else 0.0
+    rels_seconds = rels / rels_per_sec if rels_per_sec else 0.0
+
+    return {
+        "rows_estimated": rows,
+        "relationships_estimated": rels,
+        "tables": tables,
+        "relationships": relationships,
+        "rates": {
+            "rows_per_sec": rows_per_sec,
+            "relationships_per_sec": rels_per_sec,
+            "measured": bool(last),
+        },
+        "nodes_seconds": round(nodes_seconds, 1),
+        "relationships_seconds": round(rels_seconds, 1),
+        "total_seconds": round(nodes_seconds + rels_seconds, 1),
+    }
@@ -0,0 +1,219 @@
+import os
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from app.modules.Kg.batching import rate
+
+# -----------------------------
+# Defaults
+# -----------------------------
+JOB_WORKERS = int(os.getenv("KG_JOB_WORKERS", "2"))
+MAX_FINISHED_JOBS = 100
+
+FINISHED = ("succeeded", "failed", "cancelled")
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class LoadProgress:
+    """
+    Progress sink handed to load_kg. Every callback is also a cancellation
+    point, so a cancel request stops the load at the next batch boundary.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+
+        self.phase = "queued"
+        self.tables_total = 0
+        self.tables_done = 0
+        self.rows_estimated = 0
+        self.rows_loaded = 0
+        self.relationship_types_total = 0
+        self.relationship_types_done = 0
+        self.relationships_created = 0
+        self.phase_started = time.perf_counter()
+
+    # ---------- cancellation ----------
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise JobCancelled("Load cancelled")
+
+    # ---------- callbacks used by load_kg ----------
+
+    def set_phase(self, phase: str):
+        self.check()
+        with self._lock:
+            self.phase = phase
+            self.phase_started = time.perf_counter()
+
+    def plan(self, tables_total: int, relationship_types_total: int, rows_estimated: int = 0):
+        with self._lock:
+            self.tables_total = tables_total
+            self.relationship_types_total = relationship_types_total
+            self.rows_estimated = rows_estimated
+
+    def rows_written(self, n: int):
+        with self._lock:
+            self.rows_loaded += n
+        self.check()
+
+    def relationships_written(self, n: int):
+        with self._lock:
+            self.relationships_created += n
+        self.check()
+
+    def table_done(self, _stats=None):
+        with self._lock:
+            self.tables_done += 1
+        self.check()
+
+    def relationship_type_done(self, _stats=None):
+        with self._lock:
+            self.relationship_types_done += 1
+        self.check()
+
+    # ---------- reporting ----------
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            elapsed = time.perf_counter() - self.phase_started
+            eta = None
+
+            if self.phase == "nodes":
+                rows_per_sec = rate(self.rows_loaded, elapsed)
+                remaining = max(self.rows_estimated - self.rows_loaded, 0)
+                if rows_per_sec and self.rows_estimated:
+                    eta = round(remaining / rows_per_sec, 1)
+            else:
+                rows_per_sec = None
+
+            if self.phase == "relationships" and self.relationship_types_done:
+                per_type = elapsed / self.relationship_types_done
+                left = self.relationship_types_total - self.relationship_types_done
+                eta = round(per_type * left, 1)
+
+            return {
+                "phase": self.phase,
+                "tables_total": self.tables_total,
+                "tables_done": self.tables_done,
+                "rows_estimated": self.rows_estimated,
+                "rows_loaded": self.rows_loaded,
+                "rows_per_sec": rows_per_sec,
+                "relationship_types_total": self.relationship_types_total,
+                "relationship_types_done": self.relationship_types_done,
+                "relationships_created": self.relationships_created,
+                "eta_seconds": eta,
+            }
+
+
+class LoadJob:
+    def __init__(self, payload):
+        self.id = uuid.uuid4().hex
+        self.payload = payload
+        self.progress = LoadProgress()
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.future = None
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "source_database": self.payload.pg.database,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": self.progress.snapshot(),
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+# -----------------------------
+# In-process job runner
+# -----------------------------
+_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="kg-load")
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+def _run(job: LoadJob, load_fn):
+    if job.progress.cancelled:
+        job.status = "cancelled"
+        job.finished_at = time.time()
+        return
+
+    job.status = "running"
+    job.started_at = time.time()
+
+    try:
+        job.result = load_fn(job.payload, progress=job.progress)
+        job.status = "succeeded"
+        job.progress.phase = "done"
+    except JobCancelled:
+        job.status = "cancelled"
+    except Exception as e:
+        traceback.print_exc()
+        job.status = "failed"
+        job.error = str(e)
+    finally:
+        job.finished_at = time.time()
+
+
+def _prune():
+    finished = sorted(
+        (j for j in _jobs.values() if j.status in FINISHED),
+        key=lambda j: j.finished_at or 0,
+    )
+    for job in finished[:-MAX_FINISHED_JOBS]:
+        _jobs.pop(job.id, None)
+
+
+def submit_job(payload, load_fn) -> LoadJob:
+    job = LoadJob(payload)
+    with _jobs_lock:
+        _prune()
+        _jobs[job.id] = job
+    job.future = _executor.submit(_run, job, load_fn)
+    return job
+
+
+def get_job(job_id: str):
+    with _jobs_lock:
+        return _jobs.get(job_id)
+
+
+def list_jobs():
+    with _jobs_lock:
+        return sorted(_jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+
+def cancel_job(job_id: str):
+    job = get_job(job_id)
+    if job is None:
+        return None
+    if job.status not in FINISHED:
+        job.progress.cancel()
+        if job.future is not None and job.future.cancel():
+            job.status = "cancelled"
+            job.finished_at = time.time()
+    return job
@@ -1,28 +1,92 @@
-from app.modules.Kg.semantic_router import get_node_label, get_property_name
+import time
+
+from app.modules.Kg.batching import DEFAULT_BATCH_SIZE, chunked, rate
 
 
 class NodeLoader:
-    def __init__(self, neo4j):
-        self.neo4j = neo4j
+    """
+    Batched node writer.
 
-    def delete_all_nodes(self):
-        self.neo4j.run("MATCH (n) DETACH DELETE n")
+    Rows for one label are grouped into chunks of `batch_size` and each chunk
+    is written with a single UNWIND + MERGE inside one managed write
+    transaction, reusing one session for the whole table.
+    """
 
-    def load_node(self, table, row, pk, table_desc, column_desc_map):
-        label = get_node_label(table, table_desc)
+    def __init__(self, driver, database, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.driver = driver
+        self.database = database
+        self.batch_size = batch_size
 
-        props = {
-            get_property_name(c, column_desc_map.get(c, "")): v
-            for c, v in row.items()
-        }
+    def delete_all_nodes(self):
+        """
+        Deletes the graph in chunks of `batch_size` nodes, each in its own
+        transaction, instead of one huge DETACH DELETE that can exhaust the
+        Neo4j heap. CALL ... IN TRANSACTIONS needs an auto-commit query.
+        """
+        with self.driver.session(database=self.database) as session:
+            session.run(
+                f"""
+                MATCH (n)
+                CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF {int(self.batch_size)} ROWS
+                """
+            ).consume()
 
-        pk_prop = get_property_name(pk, column_desc_map.get(pk, ""))
+    @staticmethod
+    def _write_batch(tx, query, rows):
+        tx.run(query, {"rows": rows}).consume()
 
+    @staticmethod
+    def merge_query(label, pk_prop, prop_names=None, pk_idx: int = 0) -> str:
+        """
+        UNWIND + MERGE statement for one label (see load_table for the row
+        shapes).
+        """
         # ✅ ALWAYS USE BACKTICKS
-        self.neo4j.run(
-            f"""
-            MERGE (n:{label} {{ `{pk_prop}`: $pk }})
-            SET n += $props
-            """,
-            {"pk": row[pk], "props": props},
+        if prop_names is None:
+            return f"""
+        UNWIND $rows AS row
+        MERGE (n:`{label}` {{ `{pk_prop}`: row.pk }})
+        SET n += row.props
+        """
+
+        assignments = ", ".join(
+            f"n.`{prop}` = row[{i}]" for i, prop in enumerate(prop_names)
         )
+        return f"""
+        UNWIND $rows AS row
+        MERGE (n:`{label}` {{ `{pk_prop}`: row[{int(pk_idx)}] }})
+        SET {assignments}
+        """
+
+    def load_table(self, label, pk_prop, rows, on_batch=None,
+                   prop_names=None, pk_idx: int = 0):
+        """
+        rows: iterable of {"pk": <value>, "props": {<property>: <value>}}, or,
+              when prop_names is given, of value sequences aligned with
+              prop_names whose key is at pk_idx (no per-row dict, and the
+              property names are sent once in the query, not in every row)
+        on_batch: optional callback(rows_written) after every committed batch
+        """
+        query = self.merge_query(label, pk_prop, prop_names, pk_idx)
+
+        written = 0
+        batches = 0
+        started = time.perf_counter()
+
+        with self.driver.session(database=self.database) as session:
+            for batch in chunked(rows, self.batch_size):
+                session.execute_write(self._write_batch, query, batch)
+                written += len(batch)
+                batches += 1
+                if on_batch:
+                    on_batch(len(batch))
+
+        seconds = time.perf_counter() - started
+
+        return {
+            "label": label,
+            "rows": written,
+            "batches": batches,
+            "seconds": round(seconds, 3),
+            "rows_per_sec": rate(written, seconds),
+        }
@@ -0,0 +1,389 @@
+import io
+import os
+import queue
+import re
+import threading
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from app.modules.Kg.batching import DEFAULT_BATCH_SIZE
+
+# -----------------------------
+# Defaults (override via .env)
+# -----------------------------
+# "copy": COPY ... TO STDOUT parsed per column, "cursor": named-cursor fetches
+EXTRACT_METHOD_DEFAULT = os.getenv("KG_EXTRACT_METHOD", "copy")
+RSS_SAMPLE_SECONDS = float(os.getenv("KG_RSS_SAMPLE_SECONDS", "0.05"))
+
+
+# -----------------------------
+# Server-side (named) cursor streaming
+# -----------------------------
+def _quote(ident: str) -> str:
+    return '"' + ident.replace('"', '""') + '"'
+
+
+def select_sql(schema: str, table: str, columns=None, where: str | None = None,
+               row_limit: int | None = None) -> str:
+    select = ", ".join(_quote(c) for c in columns) if columns else "*"
+    sql = f"SELECT {select} FROM {_quote(schema)}.{_quote(table)}"
+    if where:
+        sql += f" WHERE {where}"
+    if row_limit:
+        sql += f" LIMIT {int(row_limit)}"
+    return sql
+
+
+def stream_table(
+    pg,
+    schema: str,
+    table: str,
+    columns=None,
+    where: str | None = None,
+    params=None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    row_limit: int | None = None,
+    datatypes=None,
+    method: str | None = None,
+):
+    """
+    Streams a table so only `batch_size` rows are held in memory at a time.
+
+    Returns (colnames, batches) where colnames are lower-cased and batches is
+    a generator of row-tuple lists. The cursor is closed when the generator
+    is exhausted or garbage collected.
+
+    datatypes: {lower-cased column: format_type()} for `columns`. When every
+    column has a COPY decoder (see copy_decoders) and method is "copy", rows
+    come from stream_table_copy; otherwise from a named cursor.
+    """
+    method = method or EXTRACT_METHOD_DEFAULT
+    if method == "copy" and columns and datatypes:
+        decoders = copy_decoders([datatypes.get(c.lower()) for c in columns])
+        if decoders is not None:
+            return stream_table_copy(
+                pg, schema, table, columns, decoders,
+                where=where, params=params,
+                batch_size=batch_size, row_limit=row_limit,
+            )
+
+    sql = select_sql(schema, table, columns, where, row_limit)
+
+    cur = pg.cursor(name=f"kg_{table}_{uuid.uuid4().hex[:8]}")
+    cur.itersize = batch_size
+    cur.execute(sql, params)
+
+    # named cursors only populate .description after the first fetch
+    first = cur.fetchmany(batch_size)
+    colnames = [d[0].lower() for d in cur.description]
+
+    def batches():
+        try:
+            rows = first
+            while rows:
+                yield rows
+                rows = cur.fetchmany(batch_size)
+        finally:
+            cur.close()
+
+    return colnames, batches()
+
+
+def iter_rows(batches):
+    for batch in batches:
+        yield from batch
+
+
+# -----------------------------
+# COPY (text format) streaming
+# -----------------------------
+_NULL = "\\N"
+_ESCAPE = re.compile(r"\\(?:([0-7]{1,3})|x([0-9a-fA-F]{1,2})|(.))")
+_ESCAPES = {"b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v"}
+
+
+def _unescape_match(m):
+    octal, hexa, char = m.groups()
+    if octal:
+        return chr(int(octal, 8))
+    if hexa:
+        return chr(int(hexa, 16))
+    return _ESCAPES.get(char, char)
+
+
+def unescape_copy(value: str) -> str:
+    """
+    Undoes COPY text-format escaping (backslash sequences).
+    """
+    if "\\" not in value:
+        return value
+    return _ESCAPE.sub(_unescape_match, value)
+
+
+def _lenient(parse):
+    # 'infinity', BC dates, years > 9999: keep the text Postgres sent
+    def convert(value):
+        try:
+            return parse(value)
+        except ValueError:
+            return value
+    return convert
+
+
+def _bytea(value: str) -> bytes:
+    # bytea_output = hex: "\\x0a0b" once COPY escaping is undone
+    return bytes.fromhex(unescape_copy(value)[2:])
+
+
+_BOOL = {"t": True, "f": False}.__getitem__
+
+# format_type() name -> converter for the COPY text form; None keeps the
+# string. Types not listed here (arrays, json, interval, ...) are read through
+# the cursor path so values stay identical to what psycopg2 returns.
+_COPY_CONVERTERS = {
+    "smallint": int,
+    "integer": int,
+    "bigint": int,
+    "oid": int,
+    "real": float,
+    "double precision": float,
+    "numeric": Decimal,
+    "boolean": _BOOL,
+    "text": None,
+    "character varying": None,
+    "character": None,
+    "name": None,
+    "citext": None,
+    "uuid": None,
+    "date": _lenient(date.fromisoformat),
+    "timestamp without time zone": _lenient(datetime.fromisoformat),
+    "timestamp with time zone": _lenient(datetime.fromisoformat),
+    "time without time zone": _lenient(time.fromisoformat),
+    "bytea": _bytea,
+}
+
+
+def copy_decoders(datatypes):
+    """
+    Converter per column for the COPY text format, or None when any column
+    has a type without one.
+    """
+    decoders = []
+    for datatype in datatypes:
+        if datatype is None or datatype not in _COPY_CONVERTERS:
+            return None
+        decoders.append(_COPY_CONVERTERS[datatype])
+    return decoders
+
+
+def _decode_column(values, convert):
+    """
+    Decodes one column of a batch at once. The common cases (no NULLs, no
+    escapes) run as a single map() over the column.
+    """
+    has_null = _NULL in values
+
+    if convert is None:
+        if any("\\" in v for v in values):
+            convert = unescape_copy
+        elif not has_null:
+            return values
+        else:
+            return [None if v == _NULL else v for v in values]
+    elif not has_null:
+        return list(map(convert, values))
+
+    return [None if v == _NULL else convert(v) for v in values]
+
+
+class _CopySink(io.TextIOBase):
+    """
+    File object for copy_expert: groups COPY lines into batches and hands
+    them to the consumer through a bounded queue.
+    """
+
+    def __init__(self, batch_size: int, out: queue.Queue, stop: threading.Event):
+        self.batch_size = batch_size
+        self.out = out
+        self.stop = stop
+        self.lines = []
+
+    def _put(self, item):
+        while not self.stop.is_set():
+            try:
+                self.out.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                pass
+        raise RuntimeError("COPY consumer went away")
+
+    def write(self, data):
+        if self.stop.is_set():
+            raise RuntimeError("COPY consumer went away")
+        self.lines.append(data)
+        if len(self.lines) >= self.batch_size:
+            self._put(self.lines)
+            self.lines = []
+        return len(data)
+
+    def flush_batch(self):
+        if self.lines:
+            self._put(self.lines)
+            self.lines = []
+
+
+def stream_table_copy(
+    pg,
+    schema: str,
+    table: str,
+    columns,
+    decoders,
+    where: str | None = None,
+    params=None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    row_limit: int | None = None,
+):
+    """
+    Same contract as stream_table, but reads
+    COPY (SELECT <columns> ...) TO STDOUT in text format and decodes each
+    batch column by column instead of letting psycopg2 build and adapt every
+    cell. copy_expert runs on a helper thread that feeds a queue bounded to
+    two batches, so memory stays at a few batches of raw lines.
+    """
+    colnames = [c.lower() for c in columns]
+
+    pg.set_client_encoding("UTF8")
+    cur = pg.cursor()
+    cur.execute("SET DateStyle TO 'ISO, YMD'")
+    cur.execute("SET bytea_output TO 'hex'")
+
+    sql = select_sql(schema, table, columns, where, row_limit)
+    if params:
+        sql = cur.mogrify(sql, params).decode("utf-8")
+    copy_sql = f"COPY ({sql}) TO STDOUT"
+
+    lines_q = queue.Queue(maxsize=2)
+    stop = threading.Event()
+    done = object()
+    failure = []
+
+    def produce():
+        sink = _CopySink(batch_size, lines_q, stop)
+        try:
+            cur.copy_expert(copy_sql, sink)
+            sink.flush_batch()
+        except Exception as e:
+            if not stop.is_set():
+                failure.append(e)
+        finally:
+            try:
+                sink._put(done)
+            except RuntimeError:
+                pass
+
+    producer = threading.Thread(target=produce, name=f"kg-copy-{table}", daemon=True)
+    producer.start()
+
+    def batches():
+        try:
+            while True:
+                lines = lines_q.get()
+                if lines is done:
+                    break
+                # "\n" ends every row; embedded newlines / tabs arrive escaped
+                rows = "".join(lines).split("\n")
+                rows.pop()
+                cells = zip(*(row.split("\t") for row in rows))
+                decoded = [
+                    _decode_column(values, convert)
+                    for values, convert in zip(cells, decoders)
+                ]
+                yield list(zip(*decoded))
+            if failure:
+                raise failure[0]
+        finally:
+            stop.set()
+            producer.join()
+            cur.close()
+
+    return colnames, batches()
+
+
+# -----------------------------
+# Memory reporting
+# -----------------------------
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss_bytes():
+    """
+    Resident set size of this process right now (None without /proc).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class RSSSampler:
+    """
+    Peak resident set size of the process while one load runs, sampled
+    from /proc/self/statm every `interval` seconds by a daemon thread.
+
+    ru_maxrss is not used: it is the peak since the process started, so a
+    long-running API would keep reporting its largest load ever. The
+    sample still covers the whole process, including any other request
+    served meanwhile. peak_mb is None where /proc is unavailable (macOS,
+    Windows).
+
+        with RSSSampler() as rss:
+            ...
+        rss.peak_mb
+    """
+
+    def __init__(self, interval: float = RSS_SAMPLE_SECONDS):
+        self.interval = interval
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        rss = current_rss_bytes()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+        return rss
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        if self._sample() is not None:
+            self._thread = threading.Thread(target=self._run, name="kg-rss-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops sampling (idempotent) and returns peak_mb.
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self._sample()
+        return self.peak_mb
+
+    @property
+    def peak_mb(self):
+        if self.peak is None:
+            return None
+        return round(self.peak / (1024 * 1024), 1)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
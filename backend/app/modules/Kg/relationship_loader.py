@@ -1,43 +1,200 @@
-from app.modules.Kg.semantic_router import (
-    get_node_label,
-    get_property_name,
-    get_relationship_name,
-)
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from neo4j.exceptions import TransientError
+
+from app.modules.Kg.batching import DEFAULT_BATCH_SIZE, chunked, rate
+
+# -----------------------------
+# Defaults (override via .env)
+# -----------------------------
+# extra attempts once the driver's own execute_write retries gave up
+WRITE_RETRIES = int(os.getenv("KG_WRITE_RETRIES", "5"))
+RETRY_BACKOFF_SECONDS = float(os.getenv("KG_RETRY_BACKOFF_SECONDS", "0.2"))
+
+
+def parent_partition(parent, partitions: int) -> int:
+    return hash(parent) % partitions
 
 
 class RelationshipLoader:
-    def __init__(self, neo4j):
-        self.neo4j = neo4j
+    """
+    Set-based relationship writer.
 
-    def create_relationship(
-        self,
-        child_table,
-        parent_table,
-        fk_column,
-        parent_pk,
-        row,
-        child_desc,
-        parent_desc,
-        column_desc_map,
-    ):
-        fk_val = row.get(fk_column)
-        if fk_val is None:
-            return
+    Takes (child_pk, parent_pk) pairs for one FK edge and links them in
+    UNWIND batches, one managed write transaction per batch.
 
-        rel = get_relationship_name(child_table, parent_table, child_desc, parent_desc)
+    With workers > 1 the pairs are hash-partitioned by parent key and each
+    partition is written by its own thread and session. Concurrent
+    transactions therefore never lock the same parent node (children are
+    unique per edge), so hot parents no longer cause lock waits or
+    DeadlockDetected between workers. Self-referencing FKs can still collide
+    (a child of one partition is a parent in another); transient errors are
+    retried with backoff.
+    """
 
-        c_label = get_node_label(child_table, child_desc)
-        p_label = get_node_label(parent_table, parent_desc)
+    def __init__(self, driver, database, batch_size: int = DEFAULT_BATCH_SIZE,
+                 workers: int = 1):
+        self.driver = driver
+        self.database = database
+        self.batch_size = batch_size
+        self.workers = max(1, workers)
 
-        fk_prop = get_property_name(fk_column, column_desc_map.get(fk_column, ""))
-        pk_prop = get_property_name(parent_pk, column_desc_map.get(parent_pk, ""))
+    @staticmethod
+    def _write_batch(tx, query, rows):
+        record = tx.run(query, {"rows": rows}).single()
+        return record["linked"] if record else 0
 
+    @staticmethod
+    def merge_query(child_label, child_pk_prop, parent_label, parent_pk_prop, rel_type) -> str:
         # ✅ ALWAYS USE BACKTICKS
-        self.neo4j.run(
-            f"""
-            MATCH (c:{c_label} {{ `{fk_prop}`: $v }})
-            MATCH (p:{p_label} {{ `{pk_prop}`: $v }})
-            MERGE (c)-[:{rel}]->(p)
-            """,
-            {"v": fk_val},
+        return f"""
+        UNWIND $rows AS row
+        MATCH (c:`{child_label}` {{ `{child_pk_prop}`: row.child }})
+        MATCH (p:`{parent_label}` {{ `{parent_pk_prop}`: row.parent }})
+        MERGE (c)-[:`{rel_type}`]->(p)
+        RETURN count(*) AS linked
+        """
+
+    def _write(self, session, query, batch):
+        """
+        Returns (linked, retries). MERGE is idempotent, so a batch whose
+        transaction was rolled back can simply be sent again.
+        """
+        for attempt in range(WRITE_RETRIES + 1):
+            try:
+                return session.execute_write(self._write_batch, query, batch), attempt
+            except TransientError as e:
+                if attempt == WRITE_RETRIES:
+                    raise
+                delay = RETRY_BACKOFF_SECONDS * (2 ** attempt) * (0.5 + random.random())
+                print(f"[KG] Transient error, retrying batch in {delay:.2f}s: {e}")
+                time.sleep(delay)
+
+    def load_edge(
+        self,
+        child_label,
+        child_pk_prop,
+        parent_label,
+        parent_pk_prop,
+        rel_type,
+        pairs,
+        on_batch=None,
+    ):
+        """
+        pairs: iterable of {"child": <child pk>, "parent": <fk value>}
+        on_batch: optional callback(relationships_linked) after every batch
+                  (called from the partition threads when workers > 1)
+        """
+        query = self.merge_query(
+            child_label, child_pk_prop, parent_label, parent_pk_prop, rel_type
         )
+        started = time.perf_counter()
+
+        if self.workers == 1:
+            counts = self._load_sequential(query, pairs, on_batch)
+        else:
+            counts = self._load_partitioned(query, pairs, on_batch)
+
+        seconds = time.perf_counter() - started
+
+        return {
+            "relationship": rel_type,
+            "child_label": child_label,
+            "parent_label": parent_label,
+            "pairs": counts["pairs"],
+            "relationships": counts["linked"],
+            "batches": counts["batches"],
+            "partitions": self.workers,
+            "retries": counts["retries"],
+            "seconds": round(seconds, 3),
+            "pairs_per_sec": rate(counts["pairs"], seconds),
+        }
+
+    def _load_sequential(self, query, pairs, on_batch):
+        counts = {"pairs": 0, "linked": 0, "batches": 0, "retries": 0}
+
+        with self.driver.session(database=self.database) as session:
+            for batch in chunked(pairs, self.batch_size):
+                batch_linked, retries = self._write(session, query, batch)
+                counts["linked"] += batch_linked
+                counts["pairs"] += len(batch)
+                counts["batches"] += 1
+                counts["retries"] += retries
+                if on_batch:
+                    on_batch(batch_linked)
+
+        return counts
+
+    def _load_partitioned(self, query, pairs, on_batch):
+        """
+        The calling thread reads the pairs and routes each one to its parent
+        partition; one thread per partition writes that partition's batches
+        in order. Queues hold at most two batches per partition.
+        """
+        partitions = self.workers
+        queues = [queue.Queue(maxsize=2) for _ in range(partitions)]
+        stop = threading.Event()
+
+        def drain(i):
+            counts = {"linked": 0, "batches": 0, "retries": 0}
+            q = queues[i]
+            try:
+                with self.driver.session(database=self.database) as session:
+                    while True:
+                        batch = q.get()
+                        if batch is None:
+                            return counts
+                        if stop.is_set():
+                            continue
+                        batch_linked, retries = self._write(session, query, batch)
+                        counts["linked"] += batch_linked
+                        counts["batches"] += 1
+                        counts["retries"] += retries
+                        if on_batch:
+                            on_batch(batch_linked)
+            except BaseException:
+                stop.set()
+                # keep the reader unblocked until it sends the end marker
+                while q.get() is not None:
+                    pass
+                raise
+
+        pairs_read = 0
+        with ThreadPoolExecutor(max_workers=partitions) as pool:
+            futures = [pool.submit(drain, i) for i in range(partitions)]
+
+            buffers = [[] for _ in range(partitions)]
+            try:
+                for pair in pairs:
+                    if stop.is_set():
+                        break
+                    i = parent_partition(pair["parent"], partitions)
+                    buffers[i].append(pair)
+                    pairs_read += 1
+                    if len(buffers[i]) >= self.batch_size:
+                        queues[i].put(buffers[i])
+                        buffers[i] = []
+
+                for i, buffer in enumerate(buffers):
+                    if buffer and not stop.is_set():
+                        queues[i].put(buffer)
+            except BaseException:
+                stop.set()
+                raise
+            finally:
+                for q in queues:
+                    q.put(None)
+
+            results = [f.result() for f in futures]
+
+        return {
+            "pairs": pairs_read,
+            "linked": sum(r["linked"] for r in results),
+            "batches": sum(r["batches"] for r in results),
+            "retries": sum(r["retries"] for r in results),
+        }
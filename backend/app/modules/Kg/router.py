@@ -1,14 +1,91 @@
 import traceback
 from fastapi import APIRouter, HTTPException
-from .schemas import KGLoadRequest
-from .service import load_kg
+from .schemas import KGLoadRequest, PostgresConfig, SemanticInvalidateRequest, SemanticWarmStartRequest
+from .service import import_legacy_names, load_kg, plan_kg
+from .bulk_import import bulk_import_kg
+from .ingest_plan import discard_plans
+from .jobs import cancel_job, get_job, list_jobs, submit_job
+from .semantic_router import invalidate_namespace, list_namespaces, namespace_for, warm_start
 
 router = APIRouter(prefix="/kg", tags=["Knowledge Graph Loader"])
 
 @router.post("/load")
 def load_knowledge_graph(req: KGLoadRequest):
+    if req.dry_run:
+        try:
+            return plan_kg(req)
+        except Exception as e:
+            traceback.print_exc()
+            raise HTTPException(status_code=500, detail=str(e))
+
+    load_fn = bulk_import_kg if req.load_method == "admin_import" else load_kg
+
+    if req.background:
+        job = submit_job(req, load_fn)
+        return {"status": job.status, "job_id": job.id}
+
     try:
-        return load_kg(req)
+        return load_fn(req)
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/jobs")
+def kg_jobs():
+    return [j.to_dict() for j in list_jobs()]
+
+
+@router.get("/jobs/{job_id}")
+def kg_job_status(job_id: str):
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@router.post("/jobs/{job_id}/cancel")
+def kg_job_cancel(job_id: str):
+    job = cancel_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@router.get("/semantic-cache")
+def semantic_cache_namespaces():
+    return list_namespaces()
+
+
+@router.post("/semantic-cache/warm-start")
+def semantic_cache_warm_start(req: SemanticWarmStartRequest):
+    source = namespace_for(req.source.database, req.source.schema_name)
+    target = namespace_for(req.target.database, req.target.schema_name)
+    return {
+        "source": source,
+        "target": target,
+        "copied": warm_start(source, target),
+        "plans_discarded": discard_plans(target),
+    }
+
+
+@router.post("/semantic-cache/import-legacy")
+def semantic_cache_import_legacy(req: PostgresConfig):
+    # one-off: names from before namespaces are never read implicitly
+    try:
+        result = import_legacy_names(req)
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+    return {**result, "plans_discarded": discard_plans(result["namespace"])}
+
+
+@router.post("/semantic-cache/invalidate")
+def semantic_cache_invalidate(req: SemanticInvalidateRequest):
+    ns = namespace_for(req.database, req.schema_name)
+    return {
+        "namespace": ns,
+        "section": req.section,
+        "deleted": invalidate_namespace(ns, req.section),
+        "plans_discarded": discard_plans(ns),
+    }
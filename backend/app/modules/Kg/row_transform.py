@@ -0,0 +1,107 @@
+import json
+from decimal import Decimal
+
+
+# -----------------------------
+# Neo4j-safe conversion (generic, per value)
+# -----------------------------
+def neo4j_safe(value):
+    if isinstance(value, Decimal):
+        return float(value)  # use str(value) if precision matters
+    return value
+
+
+# -----------------------------
+# Converters chosen from format_type()
+# -----------------------------
+def _json(value):
+    # Neo4j properties cannot hold maps: store json / jsonb as text
+    return value if isinstance(value, str) else json.dumps(value, default=str)
+
+
+def _float_list(values):
+    return [None if v is None else float(v) for v in values]
+
+
+def _json_list(values):
+    return [None if v is None else _json(v) for v in values]
+
+
+# datatype -> converter; None means the driver accepts the value as-is
+_CONVERTERS = {
+    "smallint": None,
+    "integer": None,
+    "bigint": None,
+    "oid": None,
+    "real": None,
+    "double precision": None,
+    "boolean": None,
+    "text": None,
+    "character varying": None,
+    "character": None,
+    "name": None,
+    "citext": None,
+    "uuid": None,
+    "date": None,
+    "time without time zone": None,
+    "timestamp without time zone": None,
+    "timestamp with time zone": None,
+    "interval": None,
+    "numeric": float,
+    "bytea": bytes,        # psycopg2 returns memoryview
+    "json": _json,
+    "jsonb": _json,
+    "numeric[]": _float_list,
+    "json[]": _json_list,
+    "jsonb[]": _json_list,
+}
+
+
+def converter_for(datatype: str | None):
+    """
+    Converter for one column, picked once from its format_type() name.
+    Unknown types fall back to the generic per-value neo4j_safe.
+    """
+    if datatype in _CONVERTERS:
+        return _CONVERTERS[datatype]
+    if datatype and datatype.endswith("[]"):
+        return None
+    return neo4j_safe
+
+
+class RowTransform:
+    """
+    Per-table row transform compiled once from the column types.
+
+    Only the columns whose type needs converting are touched; everything
+    else is passed through, and rows stay positional (see
+    NodeLoader.load_table(prop_names=...)) so no per-row dict is built.
+    Converting in place beats transposing the batch into columns and back:
+    the transpose costs more than it saves in CPython.
+    """
+
+    def __init__(self, colnames, datatypes):
+        self.colnames = list(colnames)
+        self.converted = [
+            (i, convert)
+            for i, convert in enumerate(converter_for(datatypes.get(c)) for c in self.colnames)
+            if convert is not None
+        ]
+
+    def rows(self, batch):
+        """
+        Converted rows of `batch` (the batch itself when nothing needs
+        converting).
+        """
+        if not self.converted:
+            return batch
+
+        out = []
+        for row in batch:
+            row = list(row)
+            for i, convert in self.converted:
+                value = row[i]
+                if value is not None:
+                    row[i] = convert(value)
+            out.append(row)
+        return out
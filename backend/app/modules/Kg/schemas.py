@@ -1,5 +1,9 @@
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
+from app.modules.Kg.batching import DEFAULT_BATCH_SIZE, MIN_BATCH_SIZE, MAX_BATCH_SIZE
+
 
 class PostgresConfig(BaseModel):
     host: str = Field(..., example="localhost")
@@ -19,3 +23,33 @@ class Neo4jConfig(BaseModel):
 class KGLoadRequest(BaseModel):
     pg: PostgresConfig
     neo4j: Neo4jConfig
+    batch_size: int = Field(
+        default=DEFAULT_BATCH_SIZE,
+        ge=MIN_BATCH_SIZE,
+        le=MAX_BATCH_SIZE,
+        example=DEFAULT_BATCH_SIZE,
+    )
+    max_workers: int = Field(default=1, ge=1, le=32, example=4)
+    sync_mode: Literal["full", "incremental"] = Field(default="full", example="incremental")
+    watermark_column: str | None = Field(default="updated_at", example="updated_at")
+    background: bool = Field(default=False, example=True)
+    # "admin_import": offline COPY -> CSV -> neo4j-admin import (see bulk_import.py)
+    load_method: Literal["bolt", "admin_import"] = Field(default="bolt", example="admin_import")
+    # reuse the stored ingest plan while the schema fingerprint is unchanged
+    reuse_plan: bool = Field(default=True, example=True)
+    # only build the plan and estimate rows / relationships / load time
+    dry_run: bool = Field(default=False, example=False)
+
+
+class SemanticNamespace(BaseModel):
+    database: str = Field(..., example="employee")
+    schema_name: str = Field(default="public", example="public")
+
+
+class SemanticWarmStartRequest(BaseModel):
+    source: SemanticNamespace
+    target: SemanticNamespace
+
+
+class SemanticInvalidateRequest(SemanticNamespace):
+    section: Literal["tables", "columns", "relationships"] | None = None
@@ -1,25 +1,20 @@
+import asyncio
+import json
 import os
-from groq import Groq
-
-MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+import re
 
+from app.llm_gateway import get_gateway
 
-def _get_client():
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        raise ValueError("GROQ_API_KEY missing in .env")
-    return Groq(api_key=api_key)
+MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
 
 
 def call_llm(prompt: str) -> str:
-    client = _get_client()
-    resp = client.chat.completions.create(
+    return get_gateway().chat(
+        prompt,
         model=MODEL,
-        messages=[{"role": "user", "content": prompt}],
         temperature=0,
         max_tokens=50,
-    )
-    return resp.choices[0].message.content.strip()
+    ).strip()
 
 
 def llm_table_label(description: str) -> str:
@@ -87,3 +82,133 @@ RULES:
 OUTPUT:
 RELATIONSHIP_ONLY
 """)
+
+
+# -----------------------------
+# Batched naming (many items per request, concurrent requests)
+# -----------------------------
+NAMING_BATCH_SIZE = int(os.getenv("GROQ_NAMING_BATCH_SIZE", "40"))
+NAMING_CONCURRENCY = int(os.getenv("GROQ_NAMING_CONCURRENCY", "4"))
+
+_BATCH_RULES = {
+    "label": """
+You are generating Neo4j NODE LABELS.
+
+RULES (per item):
+- EXACTLY ONE label
+- Represents a REAL-WORLD business entity
+- Singular noun
+- PascalCase
+- No abbreviations
+- No technical words
+- Max 3 words
+
+FORBIDDEN:
+table, record, data, mapping, xref, history, master, detail
+""",
+    "property": """
+You are generating Neo4j NODE PROPERTY NAMES.
+
+RULES (per item):
+- EXACTLY ONE property name
+- camelCase
+- Business meaning only
+- No abbreviations
+- No technical words
+- No IDs unless unavoidable
+- Max 3 words
+""",
+    "relationship": """
+You are generating Neo4j RELATIONSHIP TYPES.
+Each item describes a CHILD entity and its PARENT entity.
+
+RULES (per item):
+- EXACTLY ONE relationship name
+- ALL CAPS
+- Verb-based
+- Business meaning
+- Direction: CHILD → PARENT
+""",
+}
+
+
+def _batch_prompt(kind: str, items: dict) -> str:
+    return f"""{_BATCH_RULES[kind]}
+ITEMS (JSON object, id -> description):
+{json.dumps(items, indent=1, ensure_ascii=False)}
+
+OUTPUT:
+A JSON object with EXACTLY the same ids, id -> name.
+No markdown, no explanation.
+"""
+
+
+def _parse_json_object(text: str) -> dict:
+    text = re.sub(r"```(?:json)?", "", text or "").strip()
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end == -1:
+        return {}
+    try:
+        data = json.loads(text[start:end + 1])
+    except ValueError:
+        return {}
+    return {str(k): str(v) for k, v in data.items() if v}
+
+
+async def _name_chunk(gateway, semaphore, kind, chunk):
+    """
+    chunk: list of (key, description). Returns {key: raw name}; items the
+    model drops are simply missing and fall back to the single-item path.
+    """
+    ids = {str(i): key for i, (key, _) in enumerate(chunk, 1)}
+    items = {str(i): desc for i, (_, desc) in enumerate(chunk, 1)}
+
+    async with semaphore:
+        try:
+            resp = await gateway.acomplete(
+                _batch_prompt(kind, items),
+                model=MODEL,
+                temperature=0,
+                max_tokens=min(20 * len(chunk) + 50, 8000),
+                response_format={"type": "json_object"},
+            )
+        except Exception as e:
+            print(f"[KG] Batch naming failed for {kind} ({len(chunk)} items): {e}")
+            return kind, {}
+
+    names = _parse_json_object(resp.choices[0].message.content)
+    return kind, {ids[i]: name for i, name in names.items() if i in ids}
+
+
+async def _name_all(requests: dict) -> dict:
+    gateway = get_gateway()
+    semaphore = asyncio.Semaphore(NAMING_CONCURRENCY)
+
+    tasks = []
+    for kind, items in requests.items():
+        pairs = list(items.items())
+        for i in range(0, len(pairs), NAMING_BATCH_SIZE):
+            tasks.append(
+                _name_chunk(gateway, semaphore, kind, pairs[i:i + NAMING_BATCH_SIZE])
+            )
+
+    results = {kind: {} for kind in requests}
+    try:
+        for kind, names in await asyncio.gather(*tasks):
+            results[kind].update(names)
+    finally:
+        await gateway.aclose()
+
+    return results
+
+
+def llm_batch_names(requests: dict) -> dict:
+    """
+    requests: {"label" | "property" | "relationship": {key: description}}
+    Returns the same shape with raw (unsanitised) names.
+
+    Must be called from synchronous code (it runs its own event loop).
+    """
+    if not any(requests.values()):
+        return {kind: {} for kind in requests}
+    return asyncio.run(_name_all(requests))
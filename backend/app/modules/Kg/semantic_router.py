@@ -1,14 +1,18 @@
+import hashlib
 import os
-import json
 import re
+import time
 
 from app.modules.Kg.semantic_llm import (
+    llm_batch_names,
     llm_table_label,
     llm_column_name,
     llm_relationship_name,
 )
+from app.modules.Kg.semantic_store import LEGACY_NAMESPACE, NO_HASH, SemanticStore
 
-CACHE_FILE = "semantic_cache.json"
+CACHE_FILE = "semantic_cache.json"  # legacy format, imported on first run
+STORE_FILE = os.getenv("SEMANTIC_CACHE_DB", "semantic_cache.db")
 USE_LLM = True
 
 
@@ -71,45 +75,260 @@ def _sanitize_relationship(rel: str) -> str:
     return rel
 
 
-def load_cache():
-    if os.path.exists(CACHE_FILE):
-        try:
-            with open(CACHE_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return {"tables": {}, "columns": {}, "relationships": {}}
-    return {"tables": {}, "columns": {}, "relationships": {}}
+STORE = SemanticStore(STORE_FILE, legacy_json=CACHE_FILE)
 
+# {(namespace, section, key, desc_hash): name}
+CACHE = {}
 
-def save_cache(c):
-    with open(CACHE_FILE, "w", encoding="utf-8") as f:
-        json.dump(c, f, indent=2)
 
+def namespace_for(database: str, schema: str) -> str:
+    return f"{database}/{schema}"
 
-CACHE = load_cache()
 
+def _desc_hash(*parts) -> str:
+    raw = "\x1f".join(p or "" for p in parts)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
 
-def get_node_label(table: str, desc: str) -> str:
-    if table not in CACHE["tables"]:
+
+def _entry(ns, section, key, *desc_parts):
+    """
+    Cache key. Without a namespace the legacy, un-scoped key is used
+    (bare table / lower-cased column, no description hash).
+    """
+    if ns is None:
+        return (LEGACY_NAMESPACE, section, key, NO_HASH)
+    return (ns, section, key, _desc_hash(*desc_parts))
+
+
+def load_cache(ns: str = LEGACY_NAMESPACE) -> dict:
+    """
+    Names of one namespace in the legacy {section: {key: name}} shape.
+    """
+    data = {"tables": {}, "columns": {}, "relationships": {}}
+    for (section, key, _), value in STORE.load_namespace(ns).items():
+        data.setdefault(section, {})[key] = value
+    return data
+
+
+def save_cache(c=None):
+    """
+    Flushes buffered names to the store. `c` is accepted for backwards
+    compatibility; entries are recorded as they are named via _remember().
+    """
+    STORE.flush()
+
+
+def export_cache_json(path: str = CACHE_FILE, ns: str = LEGACY_NAMESPACE):
+    return STORE.export_json(path, ns)
+
+
+def _remember(entry, value: str) -> str:
+    ns, section, key, h = entry
+    CACHE[entry] = value
+    STORE.put(ns, section, key, value, h)
+    return value
+
+
+def _lookup(entry):
+    """
+    In-memory hit, else a name another process may have stored meanwhile.
+    Only the entry itself is consulted: names of the legacy, un-scoped
+    cache are imported explicitly (see import_legacy).
+    """
+    if entry in CACHE:
+        return CACHE[entry]
+    stored = STORE.get(*entry)
+    if stored is not None:
+        CACHE[entry] = stored
+    return stored
+
+
+def get_node_label(table: str, desc: str, ns: str | None = None) -> str:
+    entry = _entry(ns, "tables", table, desc)
+    label = _lookup(entry)
+    if label is None:
         raw = llm_table_label(desc) if USE_LLM else table.title()
-        CACHE["tables"][table] = _sanitize_label(raw)
-        save_cache(CACHE)
-    return CACHE["tables"][table]
+        label = _remember(entry, _sanitize_label(raw))
+    return label
+
 
+def _column_key(col: str, table: str | None, ns: str | None) -> str:
+    if ns is None or not table:
+        return col.lower()
+    return f"{table}.{col.lower()}"
 
-def get_property_name(col: str, desc: str) -> str:
+
+def get_property_name(col: str, desc: str, table: str | None = None,
+                      ns: str | None = None) -> str:
     key = col.lower()
-    if key not in CACHE["columns"]:
+    entry = _entry(ns, "columns", _column_key(col, table, ns), desc)
+    prop = _lookup(entry)
+    if prop is None:
         raw = llm_column_name(desc) if USE_LLM else key
-        CACHE["columns"][key] = _sanitize_property_name(raw)
-        save_cache(CACHE)
-    return CACHE["columns"][key]
+        prop = _remember(entry, _sanitize_property_name(raw))
+    return prop
 
 
-def get_relationship_name(child: str, parent: str, child_desc: str, parent_desc: str) -> str:
+def get_relationship_name(child: str, parent: str, child_desc: str, parent_desc: str,
+                          ns: str | None = None) -> str:
     key = f"{child}->{parent}"
-    if key not in CACHE["relationships"]:
+    entry = _entry(ns, "relationships", key, child_desc, parent_desc)
+    rel = _lookup(entry)
+    if rel is None:
         raw = llm_relationship_name(child_desc, parent_desc) if USE_LLM else "RELATED_TO"
-        CACHE["relationships"][key] = _sanitize_relationship(raw)
-        save_cache(CACHE)
-    return CACHE["relationships"][key]
+        rel = _remember(entry, _sanitize_relationship(raw))
+    return rel
+
+
+# -----------------------------
+# Namespace management
+# -----------------------------
+def list_namespaces() -> list:
+    return STORE.namespaces()
+
+
+def invalidate_namespace(ns: str, section: str | None = None) -> int:
+    for entry in [e for e in CACHE if e[0] == ns and (not section or e[1] == section)]:
+        CACHE.pop(entry, None)
+    return STORE.clear(ns, section)
+
+
+def warm_start(source_ns: str, target_ns: str) -> int:
+    """
+    Copies names from an already-named namespace into a new one. Entries
+    only hit when table / column / description match, so a structurally
+    similar tenant database reuses names without any LLM calls. Use
+    import_legacy for the legacy namespace (""), whose keys differ.
+    """
+    return STORE.copy_namespace(source_ns, target_ns)
+
+
+def import_legacy(schema_data, ns: str) -> int:
+    """
+    One-off migration of the pre-namespace cache into `ns`: every table,
+    column and FK edge of the extracted schema that `ns` has not named yet
+    takes its legacy name (bare table / lower-cased column / "child->parent"),
+    stored under its full namespaced key. Names already in `ns` are kept.
+    """
+    tables_by_name = {t["table"]: t for t in schema_data}
+    imported = 0
+
+    def _import(entry, section, legacy_key):
+        nonlocal imported
+        if _lookup(entry) is not None:
+            return
+        value = STORE.get(LEGACY_NAMESPACE, section, legacy_key, NO_HASH)
+        if value is not None:
+            _remember(entry, value)
+            imported += 1
+
+    for t in schema_data:
+        _import(_entry(ns, "tables", t["table"], t["short_description"]),
+                "tables", t["table"])
+
+        for c in t["columns"]:
+            key = _column_key(c["name"], t["table"], ns)
+            _import(_entry(ns, "columns", key, c["description"]),
+                    "columns", c["name"].lower())
+
+        for e in t["edges"]:
+            parent = tables_by_name.get(e["parent_table"])
+            if not parent:
+                continue
+            key = f"{t['table']}->{e['parent_table']}"
+            _import(
+                _entry(ns, "relationships", key,
+                       t["short_description"], parent["short_description"]),
+                "relationships", key,
+            )
+
+    save_cache()
+    return imported
+
+
+# -----------------------------
+# Pre-ingest naming phase
+# -----------------------------
+def prefetch_names(schema_data, ns: str | None = None) -> dict:
+    """
+    Resolves every uncached table, column and FK edge of the extracted schema
+    in batched, concurrent LLM requests and writes the cache once, so the
+    lazy get_* lookups above are all cache hits during ingest.
+    """
+    started = time.perf_counter()
+    tables_by_name = {t["table"]: t for t in schema_data}
+
+    if ns is not None:
+        for (section, key, h), value in STORE.load_namespace(ns).items():
+            CACHE[(ns, section, key, h)] = value
+
+    tables = {}
+    columns = {}
+    relationships = {}
+    entries = {}
+
+    for t in schema_data:
+        entry = _entry(ns, "tables", t["table"], t["short_description"])
+        if _lookup(entry) is None:
+            tables[t["table"]] = t["short_description"]
+            entries[("label", t["table"])] = entry
+
+        for c in t["columns"]:
+            key = _column_key(c["name"], t["table"], ns)
+            entry = _entry(ns, "columns", key, c["description"])
+            if _lookup(entry) is None and key not in columns:
+                columns[key] = c["description"]
+                entries[("property", key)] = entry
+
+        for e in t["edges"]:
+            parent = tables_by_name.get(e["parent_table"])
+            if not parent:
+                continue
+            key = f"{t['table']}->{e['parent_table']}"
+            entry = _entry(
+                ns, "relationships", key,
+                t["short_description"], parent["short_description"],
+            )
+            if _lookup(entry) is None:
+                relationships[key] = (
+                    f"CHILD: {t['short_description']} | "
+                    f"PARENT: {parent['short_description']}"
+                )
+                entries[("relationship", key)] = entry
+
+    named = {"label": {}, "property": {}, "relationship": {}}
+    if USE_LLM:
+        named = llm_batch_names({
+            "label": tables,
+            "property": columns,
+            "relationship": relationships,
+        })
+
+    sanitize = {
+        "label": _sanitize_label,
+        "property": _sanitize_property_name,
+        "relationship": _sanitize_relationship,
+    }
+    for kind, names in named.items():
+        for key, raw in names.items():
+            _remember(entries[(kind, key)], sanitize[kind](raw))
+
+    save_cache()
+
+    # another worker may have stored some of these first; its names win
+    for entry in entries.values():
+        stored = STORE.get(*entry)
+        if stored is not None:
+            CACHE[entry] = stored
+
+    return {
+        "namespace": ns,
+        "tables": len(named["label"]),
+        "columns": len(named["property"]),
+        "relationships": len(named["relationship"]),
+        "missed": (
+            len(tables) + len(columns) + len(relationships)
+            - sum(len(v) for v in named.values())
+        ),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
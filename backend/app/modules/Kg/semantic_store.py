@@ -0,0 +1,219 @@
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# -----------------------------
+# Defaults
+# -----------------------------
+FLUSH_EVERY = 50
+BUSY_TIMEOUT_MS = 30000
+
+# cache section (legacy JSON key)
+SECTIONS = ("tables", "columns", "relationships")
+
+# namespace / description hash used by the legacy, un-scoped cache
+LEGACY_NAMESPACE = ""
+NO_HASH = ""
+
+
+def _empty():
+    return {section: {} for section in SECTIONS}
+
+
+class SemanticStore:
+    """
+    SQLite (WAL) backend for the semantic naming cache.
+
+    - one row per (namespace, section, key, description hash); a namespace is
+      one source "database/schema", so names never collide across tenants
+      and a changed description is simply a new entry
+    - writes use INSERT OR IGNORE so the first process to name an item wins
+      and every process converges on it
+    - writes are buffered and flushed in one transaction every FLUSH_EVERY
+      items (and on flush() / interpreter exit)
+    - WAL + busy_timeout make it safe to share between worker processes
+    """
+
+    def __init__(self, path: str, legacy_json: str | None = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending = []
+
+        self._conn = sqlite3.connect(
+            path,
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+            isolation_level=None,  # explicit BEGIN / COMMIT below
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS semantic_entries (
+                namespace  TEXT NOT NULL,
+                section    TEXT NOT NULL,
+                key        TEXT NOT NULL,
+                desc_hash  TEXT NOT NULL,
+                value      TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (namespace, section, key, desc_hash)
+            )
+        """)
+
+        if legacy_json and self._is_empty() and os.path.exists(legacy_json):
+            self.import_json(legacy_json)
+
+        atexit.register(self.flush)
+
+    def _is_empty(self) -> bool:
+        row = self._conn.execute("SELECT 1 FROM semantic_entries LIMIT 1").fetchone()
+        return row is None
+
+    # ---------- reads ----------
+
+    def load_namespace(self, namespace: str) -> dict:
+        """
+        {(section, key, desc_hash): value} for one namespace.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT section, key, desc_hash, value
+                FROM semantic_entries WHERE namespace=?
+                """,
+                (namespace,),
+            ).fetchall()
+        return {(s, k, h): v for s, k, h, v in rows}
+
+    def get(self, namespace: str, section: str, key: str, desc_hash: str = NO_HASH):
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT value FROM semantic_entries
+                WHERE namespace=? AND section=? AND key=? AND desc_hash=?
+                """,
+                (namespace, section, key, desc_hash),
+            ).fetchone()
+        return row[0] if row else None
+
+    def namespaces(self) -> list:
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT namespace, section, COUNT(*)
+                FROM semantic_entries
+                GROUP BY namespace, section
+                ORDER BY namespace, section
+            """).fetchall()
+
+        summary = {}
+        for namespace, section, count in rows:
+            summary.setdefault(namespace, {"namespace": namespace, **{s: 0 for s in SECTIONS}})
+            summary[namespace][section] = count
+        return list(summary.values())
+
+    # ---------- writes ----------
+
+    def put(self, namespace: str, section: str, key: str, value: str,
+            desc_hash: str = NO_HASH):
+        with self._lock:
+            self._pending.append((namespace, section, key, desc_hash, value, time.time()))
+            should_flush = len(self._pending) >= FLUSH_EVERY
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    """
+                    INSERT OR IGNORE INTO semantic_entries
+                        (namespace, section, key, desc_hash, value, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    pending,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                self._pending = pending + self._pending
+                raise
+
+    def clear(self, namespace: str | None = None, section: str | None = None) -> int:
+        """
+        Invalidates one namespace (optionally one section of it), or all.
+        """
+        self.flush()
+        where, params = [], []
+        if namespace is not None:
+            where.append("namespace=?")
+            params.append(namespace)
+        if section:
+            where.append("section=?")
+            params.append(section)
+
+        sql = "DELETE FROM semantic_entries"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+    def copy_namespace(self, source: str, target: str) -> int:
+        """
+        Warm start: copies every name of `source` into `target` without
+        overwriting names `target` already has.
+        """
+        self.flush()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cur = self._conn.execute(
+                    """
+                    INSERT OR IGNORE INTO semantic_entries
+                    SELECT ?, section, key, desc_hash, value, ?
+                    FROM semantic_entries WHERE namespace=?
+                    """,
+                    (target, time.time(), source),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return cur.rowcount
+
+    # ---------- legacy JSON format ----------
+
+    def import_json(self, path: str, namespace: str = LEGACY_NAMESPACE) -> int:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return 0
+
+        count = 0
+        for section in SECTIONS:
+            for key, value in (data.get(section) or {}).items():
+                self.put(namespace, section, key, value)
+                count += 1
+        self.flush()
+        return count
+
+    def export_json(self, path: str, namespace: str = LEGACY_NAMESPACE):
+        self.flush()
+        data = _empty()
+        for (section, key, _), value in self.load_namespace(namespace).items():
+            data.setdefault(section, {})[key] = value
+
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, path)
+        return path
@@ -1,13 +1,46 @@
 import os
-from decimal import Decimal
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import psycopg2
-from neo4j import GraphDatabase, basic_auth
 
+from app.graph_version import bump_version
+from app.neo4j_pool import NEO4J_POOL_SIZE, lease_driver
+from app.modules.Kg.batching import DEFAULT_BATCH_SIZE, rate
+from app.modules.Kg.index_manager import build_key_specs, ensure_key_indexes
+from app.modules.Kg.ingest_plan import (
+    PLAN_VERSION,
+    estimate_fk_fill,
+    estimate_load,
+    load_plan,
+    plan_key,
+    plan_path,
+    record_throughput,
+    save_plan,
+    schema_fingerprint,
+)
+from app.modules.Kg.node_loader import NodeLoader
+from app.modules.Kg.pg_reader import RSSSampler, stream_table
+from app.modules.Kg.relationship_loader import RelationshipLoader
+from app.modules.Kg.row_transform import RowTransform
+from app.modules.Kg.watermarks import (
+    XMIN,
+    clear_watermarks,
+    current_xmin,
+    load_watermarks,
+    newer,
+    pick_watermark_column,
+    save_watermarks,
+    source_key,
+    watermark_filter,
+)
 from app.modules.Kg.semantic_router import (
     get_node_label,
     get_property_name,
     get_relationship_name,
+    import_legacy,
+    namespace_for,
+    prefetch_names,
     set_llm_usage
 )
 
@@ -17,78 +50,115 @@ from app.modules.Kg.semantic_router import (
 RESET_GRAPH_DEFAULT = True
 ROW_LIMIT_DEFAULT = None
 USE_LLM_DEFAULT = True
+MAX_WORKERS_DEFAULT = 1
+SYNC_MODE_DEFAULT = "full"
 
 
 # -----------------------------
-# Neo4j-safe conversion
+# Extract schema + PKs + FKs (pg_catalog, three queries per schema)
 # -----------------------------
-def neo4j_safe(value):
-    if isinstance(value, Decimal):
-        return float(value)  # use str(value) if precision matters
-    return value
+def extract_schema_from_postgres(cur, schema: str):
+    """
+    Reads columns, primary keys (including composite keys) and foreign keys
+    for every table of `schema` in three catalog queries, instead of two
+    information_schema queries per table. Like information_schema, only
+    tables the current role can SELECT from are returned.
+
+    Each table dict also carries "primary_key": list of lower-cased key
+    columns in key order (empty when the table has no PK).
+    """
+    # columns (LEFT JOIN keeps tables without columns)
+    cur.execute("""
+        SELECT c.relname, a.attname, format_type(a.atttypid, NULL)
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_attribute a
+          ON a.attrelid = c.oid
+         AND a.attnum > 0
+         AND NOT a.attisdropped
+        WHERE n.nspname = %s
+          AND c.relkind IN ('r', 'p')
+          AND NOT c.relispartition
+          AND has_table_privilege(c.oid, 'SELECT')
+        ORDER BY c.relname, a.attnum
+    """, (schema,))
 
+    tables = {}
+    for table_name, col, datatype in cur.fetchall():
+        t = tables.setdefault(table_name, {
+            "table": table_name,
+            "short_description": table_name,
+            "columns": [],
+            "edges": [],
+            "primary_key": [],
+        })
+        if col is not None:
+            t["columns"].append(
+                {"name": col, "datatype": datatype, "description": col}
+            )
 
-# -----------------------------
-# Extract schema + FKs
-# -----------------------------
-def extract_schema_from_postgres(cur, schema: str):
+    # primary keys
     cur.execute("""
-        SELECT table_name
-        FROM information_schema.tables
-        WHERE table_schema=%s AND table_type='BASE TABLE'
-        ORDER BY table_name
+        SELECT c.relname, a.attname
+        FROM pg_constraint con
+        JOIN pg_class c ON c.oid = con.conrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        CROSS JOIN LATERAL unnest(con.conkey) WITH ORDINALITY AS k(attnum, pos)
+        JOIN pg_attribute a
+          ON a.attrelid = con.conrelid
+         AND a.attnum = k.attnum
+        WHERE con.contype = 'p'
+          AND n.nspname = %s
+          AND has_table_privilege(c.oid, 'SELECT')
+        ORDER BY c.relname, k.pos
     """, (schema,))
-    tables = [r[0] for r in cur.fetchall()]
-
-    schema_data = []
-
-    for t in tables:
-        # columns
-        cur.execute("""
-            SELECT column_name, data_type
-            FROM information_schema.columns
-            WHERE table_schema=%s AND table_name=%s
-            ORDER BY ordinal_position
-        """, (schema, t))
-        cols = [
-            {"name": r[0], "datatype": r[1], "description": r[0]}
-            for r in cur.fetchall()
-        ]
+    for table_name, col in cur.fetchall():
+        if table_name in tables:
+            tables[table_name]["primary_key"].append(col.lower())
 
-        # foreign keys
-        cur.execute("""
-            SELECT
-                kcu.column_name,
-                ccu.table_name AS parent_table,
-                ccu.column_name AS parent_column
-            FROM information_schema.table_constraints tc
-            JOIN information_schema.key_column_usage kcu
-              ON tc.constraint_name = kcu.constraint_name
-             AND tc.table_schema = kcu.table_schema
-            JOIN information_schema.constraint_column_usage ccu
-              ON ccu.constraint_name = tc.constraint_name
-             AND ccu.table_schema = tc.table_schema
-            WHERE tc.constraint_type='FOREIGN KEY'
-              AND tc.table_schema=%s
-              AND tc.table_name=%s
-        """, (schema, t))
-        edges = [
-            {
-                "column_name": r[0],
-                "parent_table": r[1],
-                "parent_column": r[2],
-            }
-            for r in cur.fetchall()
-        ]
+    # foreign keys
+    cur.execute("""
+        SELECT
+            c.relname AS child_table,
+            a.attname AS column_name,
+            pc.relname AS parent_table,
+            pa.attname AS parent_column
+        FROM pg_constraint con
+        JOIN pg_class c ON c.oid = con.conrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        JOIN pg_class pc ON pc.oid = con.confrelid
+        CROSS JOIN LATERAL unnest(con.conkey, con.confkey) AS k(child_attnum, parent_attnum)
+        JOIN pg_attribute a
+          ON a.attrelid = con.conrelid
+         AND a.attnum = k.child_attnum
+        JOIN pg_attribute pa
+          ON pa.attrelid = con.confrelid
+         AND pa.attnum = k.parent_attnum
+        WHERE con.contype = 'f'
+          AND n.nspname = %s
+          AND has_table_privilege(c.oid, 'SELECT')
+          AND has_table_privilege(pc.oid, 'SELECT')
+        ORDER BY c.relname, con.conname
+    """, (schema,))
+    for child_table, col, parent_table, parent_col in cur.fetchall():
+        if child_table in tables:
+            tables[child_table]["edges"].append({
+                "column_name": col,
+                "parent_table": parent_table,
+                "parent_column": parent_col,
+            })
+
+    return [tables[name] for name in sorted(tables)]
 
-        schema_data.append({
-            "table": t,
-            "short_description": t,
-            "columns": cols,
-            "edges": edges,
-        })
 
-    return schema_data
+def primary_key_column(table: dict, schema: str) -> str:
+    """
+    Node key for a table. Composite keys use their first column, matching
+    what get_primary_key has always returned.
+    """
+    if not table.get("primary_key"):
+        raise ValueError(f"No primary key found for {schema}.{table['table']}")
+    return table["primary_key"][0]
 
 
 # -----------------------------
@@ -110,6 +180,50 @@ def get_primary_key(cur, schema: str, table: str):
     return row[0].lower()
 
 
+# -----------------------------
+# Planner statistics (cheap row estimates)
+# -----------------------------
+def estimate_row_counts(cur, schema: str) -> dict:
+    cur.execute("""
+        SELECT c.relname, GREATEST(c.reltuples, 0)::bigint
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = %s
+          AND c.relkind IN ('r', 'p')
+    """, (schema,))
+    return {r[0]: int(r[1]) for r in cur.fetchall()}
+
+
+# -----------------------------
+# FK pairs for relationship loading
+# -----------------------------
+def fetch_fk_pairs(pg, schema: str, table: str, pk_col: str, fk_col: str,
+                   batch_size: int = DEFAULT_BATCH_SIZE, delta=None, datatypes=None):
+    """
+    Streams only (child_pk, fk) pairs for one FK edge instead of re-scanning
+    the full table. `delta` restricts it to rows changed since the last sync.
+    pk_col / fk_col are the source (original-case) column names.
+    """
+    where = f'"{fk_col}" IS NOT NULL'
+    params = None
+    if delta and delta.get("where"):
+        where += f" AND {delta['where']}"
+        params = delta["params"]
+
+    colnames, batches = stream_table(
+        pg, schema, table,
+        columns=[pk_col, fk_col],
+        where=where,
+        params=params,
+        batch_size=batch_size,
+        datatypes=datatypes,
+    )
+    transform = RowTransform(colnames, datatypes or {})
+    for batch in batches:
+        for child, parent in transform.rows(batch):
+            yield {"child": child, "parent": parent}
+
+
 # -----------------------------
 # Neo4j DB handling
 # -----------------------------
@@ -123,173 +237,595 @@ def ensure_neo4j_database(driver, db_name: str):
 
 
 # -----------------------------
-# MAIN LOADER
+# Connections
 # -----------------------------
-def load_kg(payload):
-    reset_graph = RESET_GRAPH_DEFAULT
-    row_limit = ROW_LIMIT_DEFAULT
-    use_llm = USE_LLM_DEFAULT
-
-    set_llm_usage(use_llm)
-
-    if use_llm and not os.getenv("GROQ_API_KEY"):
-        raise ValueError("GROQ_API_KEY missing in .env")
-
-    # PostgreSQL
-    pg = psycopg2.connect(
-        host=payload.pg.host,
-        port=payload.pg.port,
-        database=payload.pg.database,
-        user=payload.pg.username,
-        password=payload.pg.password,
+def connect_postgres(cfg):
+    return psycopg2.connect(
+        host=cfg.host,
+        port=cfg.port,
+        database=cfg.database,
+        user=cfg.username,
+        password=cfg.password,
     )
-    cur = pg.cursor()
-    schema = payload.pg.schema_name
 
-    # Neo4j
-    driver = GraphDatabase.driver(
-        payload.neo4j.uri,
-        auth=basic_auth(payload.neo4j.user, payload.neo4j.password),
-        encrypted=False
-    )
-
-    kg_db = ensure_neo4j_database(
-        driver, f"kg_{payload.pg.database}"
-    )
 
-    schema_data = extract_schema_from_postgres(cur, schema)
-
-    # Reset graph
-    if reset_graph:
-        with driver.session(database=kg_db) as session:
-            session.run("MATCH (n) DETACH DELETE n")
-
-    loaded_rows = 0
-    created_relationships = 0
+# -----------------------------
+# Ingest plan (names resolved up-front, before any worker starts)
+# -----------------------------
+def build_table_plans(schema_data, pk_by_table, ns=None):
+    """
+    Resolves label, PK property and per-column property names for every
+    table on the calling thread, so workers never touch the semantic cache.
+    ns: semantic cache namespace of the source ("database/schema").
+    """
+    plans = {}
 
-    # -----------------------------
-    # Load nodes
-    # -----------------------------
     for table in schema_data:
         table_name = table["table"]
-        table_desc = table["short_description"]
-        label = get_node_label(table_name, table_desc)
-
-        pk_col = get_primary_key(cur, schema, table_name)
-
-        sql = f'SELECT * FROM "{schema}"."{table_name}"'
-        if row_limit:
-            sql += f" LIMIT {int(row_limit)}"
-
-        cur.execute(sql)
-        colnames = [d[0].lower() for d in cur.description]
-        rows = cur.fetchall()
+        pk_col = pk_by_table[table_name]
 
         column_desc_map = {
             c["name"].lower(): c["description"]
             for c in table["columns"]
         }
+        # original-case names for SQL; pk_col / prop_by_col keys are lower-cased
+        col_names = {c["name"].lower(): c["name"] for c in table["columns"]}
+
+        plans[table_name] = {
+            "table": table_name,
+            "label": get_node_label(table_name, table["short_description"], ns=ns),
+            "pk_col": pk_col,
+            "pk_col_name": col_names.get(pk_col, pk_col),
+            "pk_prop": get_property_name(
+                pk_col, column_desc_map.get(pk_col, ""), table=table_name, ns=ns
+            ),
+            "prop_by_col": {
+                col: get_property_name(col, desc, table=table_name, ns=ns)
+                for col, desc in column_desc_map.items()
+            },
+            # source names (for SELECT) and format_type() per lower-cased column
+            "columns": [c["name"] for c in table["columns"]],
+            "datatypes": {c["name"].lower(): c["datatype"] for c in table["columns"]},
+        }
 
-        pk_prop = get_property_name(
-            pk_col, column_desc_map.get(pk_col, "")
-        )
+    return plans
+
+
+def build_edge_plans(schema_data, plans, ns=None):
+    """
+    One entry per FK edge, grouped by relationship type.
+    """
+    tables_by_name = {t["table"]: t for t in schema_data}
+    edges_by_rel = {}
 
-        for r in rows:
-            row_dict = dict(zip(colnames, r))
-
-            props = {
-                get_property_name(c, column_desc_map.get(c, "")):
-                neo4j_safe(row_dict[c])
-                for c in colnames
-            }
-
-            with driver.session(database=kg_db) as session:
-                session.run(
-                    f"""
-                    MERGE (n:{label} {{ {pk_prop}: $pk }})
-                    SET n += $props
-                    """,
-                    {
-                        "pk": neo4j_safe(row_dict[pk_col]),
-                        "props": props,
-                    }
-                )
-
-            loaded_rows += 1
-
-    # -----------------------------
-    # Load relationships (CORRECT)
-    # -----------------------------
     for table in schema_data:
         table_name = table["table"]
-        table_desc = table["short_description"]
-        label = get_node_label(table_name, table_desc)
+        plan = plans[table_name]
+
+        for edge in table["edges"]:
+            parent_table = edge["parent_table"]
+            parent_schema = tables_by_name.get(parent_table)
+            if parent_schema is None:
+                continue
+
+            rel_type = get_relationship_name(
+                table_name,
+                parent_table,
+                table["short_description"],
+                parent_schema["short_description"],
+                ns=ns,
+            )
+
+            edges_by_rel.setdefault(rel_type, []).append({
+                "table": table_name,
+                "fk_column": edge["column_name"],
+                "child_label": plan["label"],
+                "child_pk_col": plan["pk_col"],
+                "child_pk_col_name": plan["pk_col_name"],
+                "child_pk_prop": plan["pk_prop"],
+                "datatypes": plan["datatypes"],
+                "parent_table": parent_table,
+                "parent_column": edge["parent_column"],
+                "parent_label": plans[parent_table]["label"],
+                "parent_pk_prop": get_property_name(
+                    edge["parent_column"].lower(),
+                    edge["parent_column"],
+                    table=parent_table,
+                    ns=ns,
+                ),
+                "relationship": rel_type,
+            })
+
+    return edges_by_rel
+
+
+def node_layout(plan):
+    """
+    (prop_names, pk_idx) of the positional rows read for a table plan.
+    """
+    colnames = [c.lower() for c in plan["columns"]]
+    prop_names = [plan["prop_by_col"].get(c, c) for c in colnames]
+    return prop_names, colnames.index(plan["pk_col"])
+
+
+def build_ingest_plan(pg_cfg, fingerprint: str, schema_data, use_llm: bool):
+    """
+    Names everything (semantic cache / LLM) and stores the result as the
+    source's ingest plan: labels, keys, property mappings, relationships and
+    the Cypher each worker will run. Loads with the same schema fingerprint
+    reuse it instead of introspecting and naming again.
+    """
+    schema = pg_cfg.schema_name
+    ns = namespace_for(pg_cfg.database, schema)
+
+    pk_by_table = {
+        t["table"]: primary_key_column(t, schema)
+        for t in schema_data
+    }
+    naming_stats = prefetch_names(schema_data, ns=ns)
+    plans = build_table_plans(schema_data, pk_by_table, ns=ns)
+    edges_by_rel = build_edge_plans(schema_data, plans, ns=ns)
+
+    node_cypher = {}
+    for name, plan in plans.items():
+        prop_names, pk_idx = node_layout(plan)
+        node_cypher[name] = NodeLoader.merge_query(
+            plan["label"], plan["pk_prop"], prop_names, pk_idx
+        )
 
-        pk_col = get_primary_key(cur, schema, table_name)
-        pk_prop = get_property_name(pk_col, pk_col)
+    relationship_cypher = [
+        {
+            "relationship": rel_type,
+            "table": edge["table"],
+            "fk_column": edge["fk_column"],
+            "query": RelationshipLoader.merge_query(
+                edge["child_label"], edge["child_pk_prop"],
+                edge["parent_label"], edge["parent_pk_prop"], rel_type,
+            ),
+        }
+        for rel_type, edges in edges_by_rel.items()
+        for edge in edges
+    ]
+
+    artifact = {
+        "version": PLAN_VERSION,
+        "key": plan_key(pg_cfg),
+        "namespace": ns,
+        "fingerprint": fingerprint,
+        "use_llm": use_llm,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "naming": naming_stats,
+        "schema": schema_data,
+        "tables": plans,
+        "relationships": edges_by_rel,
+        "cypher": {"nodes": node_cypher, "relationships": relationship_cypher},
+    }
+    save_plan(pg_cfg, artifact)
+    return artifact
 
-        sql = f'SELECT * FROM "{schema}"."{table_name}"'
-        cur.execute(sql)
 
-        colnames = [d[0].lower() for d in cur.description]
-        rows = cur.fetchall()
+# -----------------------------
+# Workers
+# -----------------------------
+def load_table_nodes(pg_cfg, driver, kg_db, plan, batch_size, row_limit=None,
+                     delta=None, progress=None):
+    """
+    Loads one table's nodes on its own Postgres connection and Neo4j session.
+
+    delta: {"column", "where", "params"} from the watermark store; when
+    "where" is set only rows changed since the last sync are read. The
+    highest value seen in the watermark column is returned as "watermark".
+    """
+    delta = delta or {}
+
+    pg = connect_postgres(pg_cfg)
+    try:
+        colnames, batches = stream_table(
+            pg, pg_cfg.schema_name, plan["table"],
+            columns=plan["columns"],
+            datatypes=plan["datatypes"],
+            where=delta.get("where"),
+            params=delta.get("params"),
+            batch_size=batch_size,
+            row_limit=None if delta.get("where") else row_limit,
+        )
 
-        for r in rows:
-            row_dict = dict(zip(colnames, r))
-            child_pk_val = neo4j_safe(row_dict[pk_col])
+        prop_names, pk_idx = node_layout(plan)
 
-            for edge in table["edges"]:
-                fk_col = edge["column_name"].lower()
-                fk_val = row_dict.get(fk_col)
+        wm_col = (delta.get("column") or "").lower()
+        wm_idx = colnames.index(wm_col) if wm_col in colnames else None
+        seen = {"watermark": None}
 
-                if fk_val is None:
-                    continue
+        transform = RowTransform(colnames, plan["datatypes"])
 
-                parent_table = edge["parent_table"]
-                parent_schema = next(
-                    t for t in schema_data if t["table"] == parent_table
-                )
+        def node_rows():
+            for batch in batches:
+                if wm_idx is not None:
+                    seen["watermark"] = newer(
+                        seen["watermark"],
+                        max((r[wm_idx] for r in batch if r[wm_idx] is not None), default=None),
+                    )
+                yield from transform.rows(batch)
+
+        loader = NodeLoader(driver, kg_db, batch_size=batch_size)
+        stats = loader.load_table(
+            plan["label"], plan["pk_prop"], node_rows(),
+            on_batch=progress.rows_written if progress else None,
+            prop_names=prop_names,
+            pk_idx=pk_idx,
+        )
+        stats["table"] = plan["table"]
+        stats["incremental"] = bool(delta.get("where"))
+        stats["watermark"] = seen["watermark"]
+
+        if progress:
+            progress.table_done(stats)
+        return stats
+    finally:
+        pg.close()
+
+
+def load_relationship_type(pg_cfg, driver, kg_db, edges, batch_size,
+                           deltas=None, progress=None, workers=1):
+    """
+    Loads every FK edge of one relationship type on its own connections.
+    workers: parent-key partitions written concurrently per edge.
+    """
+    deltas = deltas or {}
+
+    pg = connect_postgres(pg_cfg)
+    try:
+        loader = RelationshipLoader(driver, kg_db, batch_size=batch_size, workers=workers)
+        results = []
+
+        for edge in edges:
+            stats = loader.load_edge(
+                edge["child_label"],
+                edge["child_pk_prop"],
+                edge["parent_label"],
+                edge["parent_pk_prop"],
+                edge["relationship"],
+                fetch_fk_pairs(
+                    pg, pg_cfg.schema_name, edge["table"],
+                    edge["child_pk_col_name"], edge["fk_column"],
+                    batch_size=batch_size,
+                    delta=deltas.get(edge["table"]),
+                    datatypes=edge["datatypes"],
+                ),
+                on_batch=progress.relationships_written if progress else None,
+            )
+            stats["table"] = edge["table"]
+            stats["fk_column"] = edge["fk_column"].lower()
+            results.append(stats)
+
+        if progress:
+            progress.relationship_type_done(results)
+        return results
+    finally:
+        pg.close()
+
+
+def _run_pool(fn, jobs, max_workers):
+    """
+    Runs fn(*args) for each job; sequential when max_workers == 1 so the
+    default path stays easy to debug.
+    """
+    if max_workers <= 1 or len(jobs) <= 1:
+        return [fn(*args) for args in jobs]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(fn, *args) for args in jobs]
+        return [f.result() for f in futures]
 
-                parent_label = get_node_label(
-                    parent_table,
-                    parent_schema["short_description"]
-                )
 
-                parent_pk_prop = get_property_name(
-                    edge["parent_column"].lower(),
-                    edge["parent_column"]
-                )
-
-                rel_type = get_relationship_name(
-                    table_name,
-                    parent_table,
-                    table_desc,
-                    parent_schema["short_description"],
-                )
-
-                with driver.session(database=kg_db) as session:
-                    session.run(
-                        f"""
-                        MATCH (c:{label} {{ {pk_prop}: $child_pk }})
-                        MATCH (p:{parent_label} {{ {parent_pk_prop}: $parent_pk }})
-                        MERGE (c)-[:{rel_type}]->(p)
-                        """,
-                        {
-                            "child_pk": child_pk_val,
-                            "parent_pk": neo4j_safe(fk_val),
-                        }
-                    )
+# -----------------------------
+# DRY RUN
+# -----------------------------
+def plan_kg(payload):
+    """
+    /kg/load with dry_run: builds (or reuses) the ingest plan and estimates
+    rows, relationships and load time from planner statistics. Nothing is
+    read from the tables and Neo4j is not contacted.
+    """
+    use_llm = USE_LLM_DEFAULT
+    set_llm_usage(use_llm)
 
-                created_relationships += 1
+    schema = payload.pg.schema_name
+    max_workers = getattr(payload, "max_workers", None) or MAX_WORKERS_DEFAULT
 
-    driver.close()
-    cur.close()
-    pg.close()
+    pg = connect_postgres(payload.pg)
+    try:
+        with pg.cursor() as cur:
+            fingerprint = schema_fingerprint(cur, schema)
+            ingest_plan = (
+                load_plan(payload.pg, fingerprint, use_llm)
+                if getattr(payload, "reuse_plan", True) else None
+            )
+            plan_reused = ingest_plan is not None
+            schema_data = None if plan_reused else extract_schema_from_postgres(cur, schema)
+            row_estimates = estimate_row_counts(cur, schema)
+            fk_fill = estimate_fk_fill(cur, schema)
+    finally:
+        pg.close()
+
+    if not plan_reused:
+        if use_llm and not os.getenv("GROQ_API_KEY"):
+            raise ValueError("GROQ_API_KEY missing in .env")
+        ingest_plan = build_ingest_plan(payload.pg, fingerprint, schema_data, use_llm)
 
     return {
-        "status": "success",
-        "neo4j_database": kg_db,
-        "tables_loaded": len(schema_data),
-        "rows_loaded": loaded_rows,
-        "relationships_created": created_relationships,
+        "status": "dry_run",
+        "neo4j_database": f"kg_{payload.pg.database}",
+        "plan_reused": plan_reused,
+        "plan_path": str(plan_path(payload.pg)),
+        "fingerprint": fingerprint,
+        "estimate": estimate_load(ingest_plan, row_estimates, fk_fill, max_workers),
+        "last_load": ingest_plan.get("last_load"),
+        "tables": ingest_plan["tables"],
+        "relationships": ingest_plan["relationships"],
+        "cypher": ingest_plan["cypher"],
     }
+
+
+def import_legacy_names(pg_cfg) -> dict:
+    """
+    Opt-in migration of the pre-namespace semantic cache into the namespace
+    of this source (see semantic_router.import_legacy). Reads the catalog
+    only.
+    """
+    schema = pg_cfg.schema_name
+    pg = connect_postgres(pg_cfg)
+    try:
+        with pg.cursor() as cur:
+            schema_data = extract_schema_from_postgres(cur, schema)
+    finally:
+        pg.close()
+
+    ns = namespace_for(pg_cfg.database, schema)
+    return {"namespace": ns, "imported": import_legacy(schema_data, ns)}
+
+
+# -----------------------------
+# MAIN LOADER
+# -----------------------------
+def load_kg(payload, progress=None):
+    """
+    progress: optional LoadProgress (see jobs.py) that receives phase / batch
+    updates and can cancel the load between batches.
+    """
+    reset_graph = RESET_GRAPH_DEFAULT
+    row_limit = ROW_LIMIT_DEFAULT
+    use_llm = USE_LLM_DEFAULT
+
+    set_llm_usage(use_llm)
+
+    if use_llm and not os.getenv("GROQ_API_KEY"):
+        raise ValueError("GROQ_API_KEY missing in .env")
+
+    batch_size = getattr(payload, "batch_size", None) or DEFAULT_BATCH_SIZE
+    max_workers = getattr(payload, "max_workers", None) or MAX_WORKERS_DEFAULT
+    sync_mode = getattr(payload, "sync_mode", None) or SYNC_MODE_DEFAULT
+    incremental = sync_mode == "incremental"
+
+    # PostgreSQL
+    pg = connect_postgres(payload.pg)
+    cur = pg.cursor()
+    schema = payload.pg.schema_name
+
+    # Neo4j (shared, pooled driver; each worker holds at most two sessions)
+    max_workers = min(max_workers, max(1, NEO4J_POOL_SIZE // 2))
+    try:
+        neo4j_lease = lease_driver(
+            payload.neo4j.uri,
+            payload.neo4j.user,
+            payload.neo4j.password,
+            f"kg_{payload.pg.database}",
+        )
+    except Exception:
+        pg.close()
+        raise
+    driver = neo4j_lease.driver
+
+    rss = RSSSampler().start()
+    kg_db = None
+    try:
+        if progress:
+            progress.set_phase("schema")
+
+        kg_db = ensure_neo4j_database(
+            driver, f"kg_{payload.pg.database}"
+        )
+
+        # stored ingest plan: skips introspection and naming when the
+        # schema fingerprint is unchanged
+        fingerprint = schema_fingerprint(cur, schema)
+        ingest_plan = (
+            load_plan(payload.pg, fingerprint, use_llm)
+            if getattr(payload, "reuse_plan", True) else None
+        )
+        plan_reused = ingest_plan is not None
+
+        if plan_reused:
+            schema_data = ingest_plan["schema"]
+        else:
+            schema_data = extract_schema_from_postgres(cur, schema)
+            for t in schema_data:
+                primary_key_column(t, schema)   # fail before any naming
+
+        # -----------------------------
+        # Watermarks (taken before any row is read)
+        # -----------------------------
+        wm_key = source_key(payload.pg, kg_db)
+        marks = load_watermarks(wm_key) if incremental else {}
+        sync_xid = current_xmin(cur)
+        wm_preferred = getattr(payload, "watermark_column", None)
+
+        deltas = {}
+        for t in schema_data:
+            col = pick_watermark_column(t, wm_preferred)
+            mark = marks.get(t["table"])
+            if mark and mark.get("column") != col:
+                mark = None
+            where, params = watermark_filter(mark, sync_xid)
+            deltas[t["table"]] = {"column": col, "where": where, "params": params}
+
+        row_estimates = estimate_row_counts(cur, schema)
+
+        cur.close()
+        pg.close()
+
+        # -----------------------------
+        # Naming phase (batched LLM calls before any row is touched)
+        # -----------------------------
+        if not plan_reused:
+            if progress:
+                progress.set_phase("naming")
+            ingest_plan = build_ingest_plan(payload.pg, fingerprint, schema_data, use_llm)
+
+        plans = ingest_plan["tables"]
+        edges_by_rel = ingest_plan["relationships"]
+        naming_stats = {"skipped": "plan reused"} if plan_reused else ingest_plan["naming"]
+
+        if progress:
+            progress.plan(
+                len(plans),
+                len(edges_by_rel),
+                sum(row_estimates.get(t, 0) for t in plans),
+            )
+
+        # Reset graph (full loads only; incremental syncs upsert in place)
+        reset_seconds = 0.0
+        if reset_graph and not incremental:
+            if progress:
+                progress.set_phase("reset")
+            reset_started = time.perf_counter()
+            NodeLoader(driver, kg_db, batch_size=batch_size).delete_all_nodes()
+            reset_seconds = time.perf_counter() - reset_started
+
+        # -----------------------------
+        # Key constraints / indexes (before any MERGE)
+        # -----------------------------
+        if progress:
+            progress.set_phase("indexes")
+
+        node_keys = [
+            (p["table"], p["label"], p["pk_prop"])
+            for p in plans.values()
+        ]
+        lookup_keys = [
+            (e["parent_label"], e["parent_pk_prop"])
+            for edges in edges_by_rel.values()
+            for e in edges
+        ]
+        index_stats = ensure_key_indexes(
+            driver, kg_db, build_key_specs(node_keys, lookup_keys)
+        )
+
+        # -----------------------------
+        # Load nodes (batched UNWIND per label, tables in parallel)
+        # -----------------------------
+        if progress:
+            progress.set_phase("nodes")
+
+        nodes_started = time.perf_counter()
+
+        table_stats = _run_pool(
+            load_table_nodes,
+            [
+                (payload.pg, driver, kg_db, plan, batch_size, row_limit,
+                 deltas[plan["table"]], progress)
+                for plan in plans.values()
+            ],
+            max_workers,
+        )
+
+        nodes_seconds = time.perf_counter() - nodes_started
+        loaded_rows = sum(t["rows"] for t in table_stats)
+
+        # -----------------------------
+        # Load relationships (set-based; one edge at a time, each split into
+        # parent-key partitions written in parallel, so concurrent
+        # transactions never lock the same parent node)
+        # -----------------------------
+        if progress:
+            progress.set_phase("relationships")
+
+        rels_started = time.perf_counter()
+
+        relationship_stats = [
+            stats
+            for edges in edges_by_rel.values()
+            for stats in load_relationship_type(
+                payload.pg, driver, kg_db, edges, batch_size, deltas,
+                progress, workers=max_workers,
+            )
+        ]
+
+        rels_seconds = time.perf_counter() - rels_started
+        created_relationships = sum(r["relationships"] for r in relationship_stats)
+
+        # -----------------------------
+        # Persist new watermarks (only after a successful load)
+        # -----------------------------
+        new_marks = {}
+        for stats in table_stats:
+            table_name = stats["table"]
+            col = deltas[table_name]["column"]
+            seen = stats.pop("watermark", None)
+            if col == XMIN:
+                value = sync_xid
+            elif seen is not None:
+                # delta rows are all newer than the previous mark
+                value = seen
+            else:
+                previous = marks.get(table_name) or {}
+                value = previous.get("value") if previous.get("column") == col else None
+            new_marks[table_name] = {"column": col, "value": value}
+
+        if row_limit and not incremental:
+            # a partial full load is not a valid baseline for later deltas
+            clear_watermarks(wm_key)
+        else:
+            save_watermarks(wm_key, new_marks)
+
+        if not incremental and not row_limit:
+            record_throughput(payload.pg, fingerprint, {
+                "rows": loaded_rows,
+                "relationships": created_relationships,
+                "rows_per_sec": rate(loaded_rows, nodes_seconds),
+                "relationships_per_sec": rate(created_relationships, rels_seconds),
+                "max_workers": max_workers,
+            })
+
+        return {
+            "status": "success",
+            "sync_mode": sync_mode,
+            "neo4j_database": kg_db,
+            "tables_loaded": len(schema_data),
+            "rows_loaded": loaded_rows,
+            "relationships_created": created_relationships,
+            "batch_size": batch_size,
+            "max_workers": max_workers,
+            "naming": naming_stats,
+            "plan": {
+                "reused": plan_reused,
+                "fingerprint": fingerprint,
+                "path": str(plan_path(payload.pg)),
+            },
+            "reset_seconds": round(reset_seconds, 3),
+            "index_seconds": index_stats["seconds"],
+            "indexes": index_stats["indexes"],
+            "nodes_seconds": round(nodes_seconds, 3),
+            "rows_per_sec": rate(loaded_rows, nodes_seconds),
+            "relationships_seconds": round(rels_seconds, 3),
+            "peak_rss_mb": rss.stop(),       # this load only
+            "tables": table_stats,
+            "relationship_types": relationship_stats,
+        }
+    finally:
+        rss.stop()
+        neo4j_lease.close()
+        pg.close()
+        # anything may have been written: read-side caches must refresh
+        if kg_db is not None:
+            bump_version(payload.neo4j.uri, kg_db)
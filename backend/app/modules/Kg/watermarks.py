@@ -0,0 +1,99 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+# --------------------------------------------------
+# Artifact directory
+# --------------------------------------------------
+WATERMARK_DIR = Path("artifacts/kg")
+WATERMARK_FILE = WATERMARK_DIR / "watermarks.json"
+
+XMIN = "xmin"
+XID_MODULO = 2 ** 32
+
+_lock = threading.Lock()
+
+
+def source_key(pg_cfg, kg_db: str) -> str:
+    return f"{pg_cfg.host}:{pg_cfg.port}/{pg_cfg.database}/{pg_cfg.schema_name}->{kg_db}"
+
+
+def _read_all() -> dict:
+    if not WATERMARK_FILE.exists():
+        return {}
+    try:
+        return json.loads(WATERMARK_FILE.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+
+def load_watermarks(key: str) -> dict:
+    """
+    Returns {table: {"column": <col or "xmin">, "value": <last value>}}
+    """
+    with _lock:
+        return _read_all().get(key, {})
+
+
+def save_watermarks(key: str, marks: dict):
+    with _lock:
+        WATERMARK_DIR.mkdir(parents=True, exist_ok=True)
+        data = _read_all()
+        data[key] = marks
+
+        # atomic replace so a crash never leaves a half-written file
+        tmp = WATERMARK_FILE.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, indent=2, default=str), encoding="utf-8")
+        os.replace(tmp, WATERMARK_FILE)
+
+
+def clear_watermarks(key: str):
+    save_watermarks(key, {})
+
+
+def current_xmin(cur) -> int:
+    """
+    Oldest transaction still in progress: everything below it is committed
+    and visible, so it is a safe xmin high-watermark for the next sync.
+    """
+    cur.execute("SELECT txid_snapshot_xmin(txid_current_snapshot())")
+    return int(cur.fetchone()[0])
+
+
+def pick_watermark_column(table: dict, preferred: str | None) -> str:
+    if preferred:
+        for c in table["columns"]:
+            if c["name"].lower() == preferred.lower():
+                return c["name"]
+    return XMIN
+
+
+def watermark_filter(mark: dict | None, current_xid: int):
+    """
+    Builds (where_sql, params) for rows changed since `mark`.
+    Returns (None, None) when the whole table has to be read.
+    """
+    if not mark or mark.get("value") is None:
+        return None, None
+
+    if mark["column"] == XMIN:
+        last = int(mark["value"]) % XID_MODULO
+        # 32-bit xid wrapped around since the last sync -> full table
+        if last > current_xid % XID_MODULO:
+            return None, None
+        return "xmin::text::bigint >= %s", (last,)
+
+    col = mark["column"].replace('"', '""')
+    return f'"{col}" > %s', (mark["value"],)
+
+
+def newer(a, b):
+    """
+    max() that tolerates None.
+    """
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return a if a >= b else b
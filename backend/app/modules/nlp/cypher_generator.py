@@ -1,9 +1,9 @@
-from groq import Groq
+from app.llm_gateway import get_gateway
 
 
 class GroqCypherGenerator:
     def __init__(self, api_key: str):
-        self.client = Groq(api_key=api_key)
+        self.gateway = get_gateway(api_key)
 
     def generate_cypher(self, question: str, schema: str) -> str:
         prompt = f"""
@@ -32,7 +32,7 @@ Question:
 {question}
 """
 
-        response = self.client.chat.completions.create(
+        response = self.gateway.complete(
             model="llama-3.3-70b-versatile",
             messages=[{"role": "user", "content": prompt}],
             temperature=0,
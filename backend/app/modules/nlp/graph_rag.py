@@ -1,9 +1,9 @@
-from neo4j import GraphDatabase
-
+from app.neo4j_pool import lease_driver
 from app.modules.nlp.neo4j_schema_extractor import Neo4jSchemaExtractor1
 from app.modules.nlp.neo4j_executor import Neo4jExecutor
 from app.modules.nlp.groq_cypher import GroqCypherGenerator
 from app.modules.nlp.groq_client import GroqClient
+from app.modules.nlp.schema_cache import get_schema
 
 from app.modules.nlp.cypher_utils import (
     sanitize_cypher,
@@ -22,11 +22,12 @@ class GraphRAG:
         neo4j_database: str,
         groq_api_key: str,
     ):
-        self.driver = GraphDatabase.driver(
-            neo4j_uri,
-            auth=(neo4j_user, neo4j_password),
+        self._lease = lease_driver(
+            neo4j_uri, neo4j_user, neo4j_password, neo4j_database
         )
+        self.driver = self._lease.driver
 
+        self.uri = neo4j_uri
         self.database = neo4j_database
 
         self.schema_extractor = Neo4jSchemaExtractor1(
@@ -41,14 +42,12 @@ class GraphRAG:
         self.groq = GroqClient(groq_api_key)
 
     def close(self):
-        try:
-            self.driver.close()
-        except Exception:
-            pass
+        self.schema_extractor.close()
+        self._lease.close()
 
     def ask(self, question: str) -> str:
-        # 1) Extract schema
-        schema = self.schema_extractor.extract()
+        # 1) Extract schema (cached per graph, refreshed after /kg/load)
+        schema = get_schema(self.uri, self.database, self.schema_extractor.extract)
 
         # 2) Generate cypher using Groq
         cypher = self.cypher_generator.generate_cypher(question, str(schema))
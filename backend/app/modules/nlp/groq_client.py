@@ -1,14 +1,28 @@
-from groq import Groq
+from app.llm_gateway import get_gateway
 
 
 class GroqClient:
     def __init__(self, api_key: str):
-        self.client = Groq(api_key=api_key)
+        # shared, pooled + rate-limited client (see app/llm_gateway.py)
+        self.gateway = get_gateway(api_key)
 
     def chat(self, prompt: str, model="llama-3.3-70b-versatile", temperature=0):
-        response = self.client.chat.completions.create(
-            model=model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=temperature
-        )
-        return response.choices[0].message.content
+        return self.gateway.chat(prompt, model=model, temperature=temperature)
+
+    def stream(self, prompt: str, model="llama-3.3-70b-versatile", temperature=0):
+        """
+        Yields the completion text as Groq streams it.
+        """
+        chunks = self.gateway.complete(prompt, model=model, temperature=temperature, stream=True)
+        for chunk in chunks:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def achat(self, prompt: str, model="llama-3.3-70b-versatile", temperature=0):
+        return await self.gateway.achat(prompt, model=model, temperature=temperature)
+
+    async def astream(self, prompt: str, model="llama-3.3-70b-versatile", temperature=0):
+        chunks = await self.gateway.acomplete(prompt, model=model, temperature=temperature, stream=True)
+        async for chunk in chunks:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
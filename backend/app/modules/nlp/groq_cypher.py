@@ -1,11 +1,33 @@
-from groq import Groq
+from app.llm_gateway import get_gateway
 
 class GroqCypherGenerator:
     def __init__(self, api_key: str):
-        self.client = Groq(api_key=api_key)
+        self.gateway = get_gateway(api_key)
 
-    def generate_cypher(self, question: str, schema: str) -> str:
-        prompt = f"""
+    def generate_cypher(self, question: str, schema: str, examples=None) -> str:
+        """
+        examples: optional [{"question", "cypher"}] of similar questions
+        answered before, added to the prompt as few-shot examples.
+        """
+        response = self.gateway.complete(
+            model="llama-3.3-70b-versatile",
+            messages=[{"role": "user", "content": self._prompt(question, schema, examples)}],
+            temperature=0
+        )
+
+        return response.choices[0].message.content.strip()
+
+    async def agenerate_cypher(self, question: str, schema: str, examples=None) -> str:
+        response = await self.gateway.acomplete(
+            model="llama-3.3-70b-versatile",
+            messages=[{"role": "user", "content": self._prompt(question, schema, examples)}],
+            temperature=0
+        )
+
+        return response.choices[0].message.content.strip()
+
+    def _prompt(self, question: str, schema: str, examples=None) -> str:
+        return f"""
 You are an expert Neo4j Cypher developer.
 
 Graph schema:
@@ -34,15 +56,17 @@ CRITICAL RULES (must follow exactly):
       RETURN staffName, incidentCount
 9) RETURN must be at the end.
 10) No markdown, no explanation, output ONLY the Cypher query.
-
+{self._examples_block(examples)}
 Question:
 {question}
 """
 
-        response = self.client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0
-        )
-
-        return response.choices[0].message.content.strip()
+    @staticmethod
+    def _examples_block(examples) -> str:
+        if not examples:
+            return ""
+        lines = ["", "Similar questions answered before (adapt, do not copy blindly):"]
+        for ex in examples:
+            lines.append(f"Q: {ex['question']}")
+            lines.append(f"Cypher: {ex['cypher']}")
+        return "\n".join(lines) + "\n"
@@ -1,10 +1,10 @@
-from groq import Groq
+from app.llm_gateway import get_gateway
 import json
 
 
 class GroqSummarizer:
     def __init__(self, api_key: str):
-        self.client = Groq(api_key=api_key)
+        self.gateway = get_gateway(api_key)
 
     def summarize(self, question: str, rows: list) -> str:
         # keep payload small
@@ -28,7 +28,7 @@ Rules:
 - Keep answer within 2-5 lines
 """
 
-        resp = self.client.chat.completions.create(
+        resp = self.gateway.complete(
             model="llama-3.3-70b-versatile",
             messages=[{"role": "user", "content": prompt}],
             temperature=0
@@ -1,12 +1,29 @@
-from neo4j import GraphDatabase
-
-
 class Neo4jExecutor:
-    def __init__(self, uri: str, user: str, password: str, database: str):
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+    """
+    Runs generated Cypher on a shared driver (see app/neo4j_pool.py); the
+    driver is owned by the caller and never closed here.
+    """
+
+    def __init__(self, driver, database: str):
+        self.driver = driver
         self.database = database
 
     def run(self, cypher: str):
         with self.driver.session(database=self.database) as session:
             result = session.run(cypher)
             return [r.data() for r in result]
+
+
+class AsyncNeo4jExecutor:
+    """
+    Same as Neo4jExecutor on an AsyncGraphDatabase driver.
+    """
+
+    def __init__(self, driver, database: str):
+        self.driver = driver
+        self.database = database
+
+    async def run(self, cypher: str):
+        async with self.driver.session(database=self.database) as session:
+            result = await session.run(cypher)
+            return await result.data()
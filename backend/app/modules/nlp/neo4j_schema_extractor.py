@@ -1,45 +1,173 @@
-from neo4j import GraphDatabase
+import os
+
+from app.neo4j_pool import lease_driver
+
+# -----------------------------
+# Defaults (override via .env)
+# -----------------------------
+SCHEMA_MODE_DEFAULT = os.getenv("NLP_SCHEMA_MODE", "metadata")   # metadata | sample
+SAMPLE_SIZE_DEFAULT = int(os.getenv("NLP_SCHEMA_SAMPLE_SIZE", "50"))
+# db.schema.relTypeProperties() reads every relationship: opt-in only
+REL_PROPERTIES_DEFAULT = os.getenv("NLP_SCHEMA_REL_PROPERTIES", "false").lower() == "true"
+
 
 class Neo4jSchemaExtractor1:
-    def __init__(self, uri: str, user: str, password: str, database: str):
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+    """
+    Graph schema for Cypher generation.
+
+    mode="metadata" (default) takes the relationship patterns from
+    db.schema.visualization(), which is answered from the count store, and
+    the node properties from `sample_size` nodes per label, so no query
+    touches more than a bounded number of nodes. db.schema.nodeTypeProperties
+    / relTypeProperties are not used by default: both scan every node or
+    relationship. rel_properties=True adds relTypeProperties for callers
+    that accept that full scan.
+
+    mode="sample" also infers the relationships from the sampled nodes and
+    is used as a fallback when db.schema.visualization is not available.
+    """
+
+    def __init__(self, uri: str, user: str, password: str, database: str,
+                 mode: str = SCHEMA_MODE_DEFAULT, sample_size: int = SAMPLE_SIZE_DEFAULT,
+                 rel_properties: bool = REL_PROPERTIES_DEFAULT):
+        self._lease = lease_driver(uri, user, password, database)
+        self.driver = self._lease.driver
         self.database = database
+        self.mode = mode
+        self.sample_size = sample_size
+        self.rel_properties = rel_properties
 
     def close(self):
-        self.driver.close()
+        # releases the shared driver; the pool keeps it open
+        self._lease.close()
+
+    # ---------- metadata procedures ----------
+
+    @staticmethod
+    def _rel_type_properties(tx):
+        query = """
+        CALL db.schema.relTypeProperties()
+        YIELD relType, propertyName, propertyTypes
+        RETURN relType, propertyName, propertyTypes
+        """
+        return [r.data() for r in tx.run(query)]
+
+    @staticmethod
+    def _visualization(tx):
+        record = tx.run(
+            "CALL db.schema.visualization() YIELD nodes, relationships "
+            "RETURN nodes, relationships"
+        ).single()
+        if record is None:
+            return []
+
+        labels_by_id = {
+            n.element_id: (list(n.labels) or [n.get("name")])[0]
+            for n in record["nodes"]
+        }
+        return [
+            {
+                "type": r.type,
+                "start": labels_by_id.get(r.start_node.element_id),
+                "end": labels_by_id.get(r.end_node.element_id),
+            }
+            for r in record["relationships"]
+        ]
+
+    def _extract_metadata(self, session) -> dict:
+        patterns = session.execute_read(self._visualization)
+
+        schema = {}
+        for label in session.execute_read(self._get_labels):
+            schema[label] = {
+                "properties": session.execute_read(
+                    self._infer_node_properties, label, self.sample_size
+                ),
+                "relationships": [],
+            }
+
+        for rel in patterns:
+            start, end = rel["start"], rel["end"]
+            for label, target, direction in ((start, end, "OUT"), (end, start, "IN")):
+                if not label:
+                    continue
+                entry = schema.setdefault(label, {"properties": [], "relationships": []})
+                item = {"type": rel["type"], "target": target, "direction": direction}
+                if item not in entry["relationships"]:
+                    entry["relationships"].append(item)
+
+        result = {"schema": schema}
+        if not self.rel_properties:
+            return result
+
+        rel_properties = {}
+        for row in session.execute_read(self._rel_type_properties):
+            # relType comes back as ":`TYPE`"
+            rel_type = (row["relType"] or "").lstrip(":").strip("`")
+            props = rel_properties.setdefault(rel_type, {})
+            if row["propertyName"]:
+                props[row["propertyName"]] = row["propertyTypes"] or []
+        result["relationship_properties"] = rel_properties
+        return result
+
+    # ---------- bounded sampling ----------
 
     @staticmethod
     def _get_labels(tx):
         return [r["label"] for r in tx.run("CALL db.labels()")]
 
     @staticmethod
-    def _infer_node_properties(tx, label):
+    def _infer_node_properties(tx, label, limit):
         query = f"""
         MATCH (n:`{label}`)
-        WITH n LIMIT 50
+        WITH n LIMIT $limit
         UNWIND keys(n) AS key
         RETURN DISTINCT key
         """
-        return [r["key"] for r in tx.run(query)]
+        return [r["key"] for r in tx.run(query, limit=limit)]
 
     @staticmethod
-    def _infer_relationships(tx, label):
+    def _infer_relationships(tx, label, limit):
         query = f"""
-        MATCH (a:`{label}`)-[r]-(b)
-        RETURN DISTINCT type(r) AS type, labels(b)[0] AS target
+        MATCH (a:`{label}`)
+        WITH a LIMIT $limit
+        MATCH (a)-[r]-(b)
+        WITH r, b, startNode(r) = a AS outgoing
+        LIMIT $rel_limit
+        RETURN DISTINCT type(r) AS type, labels(b)[0] AS target, outgoing
         """
-        return [{"type": r["type"], "target": r["target"]} for r in tx.run(query)]
+        return [
+            {
+                "type": r["type"],
+                "target": r["target"],
+                "direction": "OUT" if r["outgoing"] else "IN",
+            }
+            for r in tx.run(query, limit=limit, rel_limit=limit * 20)
+        ]
 
-    def extract(self) -> dict:
+    def _extract_sample(self, session) -> dict:
         schema = {}
+        labels = session.execute_read(self._get_labels)
 
-        with self.driver.session(database=self.database) as session:
-            labels = session.execute_read(self._get_labels)
-
-            for label in labels:
-                schema[label] = {
-                    "properties": session.execute_read(self._infer_node_properties, label),
-                    "relationships": session.execute_read(self._infer_relationships, label),
-                }
+        for label in labels:
+            schema[label] = {
+                "properties": session.execute_read(
+                    self._infer_node_properties, label, self.sample_size
+                ),
+                "relationships": session.execute_read(
+                    self._infer_relationships, label, self.sample_size
+                ),
+            }
 
         return {"schema": schema}
+
+    # ---------- public API ----------
+
+    def extract(self) -> dict:
+        with self.driver.session(database=self.database) as session:
+            if self.mode == "metadata":
+                try:
+                    return self._extract_metadata(session)
+                except Exception as e:
+                    print(f"[NLP] db.schema.visualization failed, sampling instead: {e}")
+            return self._extract_sample(session)
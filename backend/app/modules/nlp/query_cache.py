@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from app.graph_version import current_version, graph_key
+
+# -----------------------------
+# Defaults (override via .env)
+# -----------------------------
+CYPHER_CACHE_SIZE = int(os.getenv("NLP_CYPHER_CACHE_SIZE", "1000"))          # entries
+RESULT_CACHE_SIZE = int(os.getenv("NLP_RESULT_CACHE_SIZE", "500"))            # entries
+RESULT_CACHE_MAX_BYTES = int(os.getenv("NLP_RESULT_CACHE_MAX_MB", "64")) * 1024 * 1024
+RESULT_TTL_SECONDS = int(os.getenv("NLP_RESULT_TTL_SECONDS", "300"))          # writes outside /kg/load
+
+
+# -----------------------------
+# Question normalisation
+# -----------------------------
+_QUOTED = re.compile(r"(\"[^\"]*\"|'[^']*')")
+_FILLER = re.compile(
+    r"^(please\s+|can you\s+|could you\s+|would you\s+|tell me\s+|show me\s+|i want to know\s+|the\s+)+"
+)
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    """
+    Canonical form of a question for cache keys: unicode/whitespace/case
+    folded, leading politeness and trailing punctuation dropped. Quoted
+    literals keep their case, since they end up in the Cypher as values.
+    """
+    text = unicodedata.normalize("NFKC", question or "")
+    text = text.replace("“", '"').replace("”", '"')
+    text = text.replace("‘", "'").replace("’", "'")
+
+    parts = _QUOTED.split(text)
+    text = "".join(p if _QUOTED.fullmatch(p) else p.casefold() for p in parts)
+
+    text = _SPACES.sub(" ", text).strip()
+    text = _FILLER.sub("", text)
+    return text.rstrip(" ?!.")
+
+
+def schema_fingerprint(schema) -> str:
+    raw = json.dumps(schema, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+# -----------------------------
+# Bounded LRU
+# -----------------------------
+class LRUCache:
+    """
+    Thread-safe LRU bounded by entry count and (optionally) by the JSON size
+    of the values. Tracks hits, misses and the LLM time hits saved.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int | None = None,
+                 ttl_seconds: int | None = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._data = OrderedDict()   # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saved_llm_seconds = 0.0
+
+    @staticmethod
+    def _size(value) -> int:
+        return len(json.dumps(value, default=str))
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            value, size, expires_at = item
+            if expires_at is not None and expires_at < time.monotonic():
+                self._drop(key)
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def record_saved(self, llm_seconds: float):
+        """
+        Books the LLM time a hit made unnecessary.
+        """
+        with self._lock:
+            self.saved_llm_seconds += llm_seconds
+
+    def put(self, key, value):
+        size = self._size(value) if self.max_bytes else 0
+        if self.max_bytes and size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (value, size, expires_at)
+            self._bytes += size
+
+            while self._data and (
+                len(self._data) > self.max_entries
+                or (self.max_bytes and self._bytes > self.max_bytes)
+            ):
+                self._drop(next(iter(self._data)))
+                self.evictions += 1
+
+    def _drop(self, key):
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+                "evictions": self.evictions,
+                "saved_llm_seconds": round(self.saved_llm_seconds, 3),
+            }
+
+
+# -----------------------------
+# Two-level /nlp cache
+# -----------------------------
+# L1: (graph, schema fingerprint, normalised question)
+#     -> {"cypher", "llm_seconds"}
+# L2: (graph, graph version, Cypher)
+#     -> {"rows", "question", "summary", "llm_seconds"}
+CYPHER_CACHE = LRUCache(CYPHER_CACHE_SIZE)
+RESULT_CACHE = LRUCache(RESULT_CACHE_SIZE, RESULT_CACHE_MAX_BYTES, RESULT_TTL_SECONDS)
+
+
+def cypher_key(uri, database, schema, question) -> tuple:
+    return graph_key(uri, database), schema_fingerprint(schema), normalize_question(question)
+
+
+def result_key(uri, database, cypher) -> tuple:
+    # a /kg/load bumps the graph version, so older results are never hit again
+    return graph_key(uri, database), current_version(uri, database), cypher.strip()
+
+
+def cache_stats() -> dict:
+    return {
+        "cypher_cache": CYPHER_CACHE.stats(),
+        "result_cache": RESULT_CACHE.stats(),
+    }
+
+
+def clear_caches():
+    CYPHER_CACHE.clear()
+    RESULT_CACHE.clear()
@@ -1,6 +1,11 @@
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from .service import ask_question
+from .service import aask_question, aask_question_events
+from .query_cache import cache_stats
+from .similar_questions import similar_stats
+from app.neo4j_pool import pool_stats
+from app.sse import SSE_HEADERS, asse_stream
 
 router = APIRouter(prefix="/nlp", tags=["NLP"])
 
@@ -11,6 +16,30 @@ class AskRequest(BaseModel):
     neo4j_database: str
     question: str
 
+# async end to end: a question waiting on Neo4j or Groq does not hold a
+# threadpool thread (the sync pipeline stays in service.ask_question)
 @router.post("/ask")
-def ask(req: AskRequest):
-    return ask_question(req)
+async def ask(req: AskRequest):
+    return await aask_question(req)
+
+
+@router.post("/ask/stream")
+async def ask_stream(req: AskRequest):
+    """
+    Server-Sent Events: start, schema, cypher, rows, token (summary text as
+    Groq produces it), done - or error.
+    """
+    return StreamingResponse(
+        asse_stream(aask_question_events(req)),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+@router.get("/metrics")
+def metrics():
+    return {
+        **cache_stats(),
+        "similar_questions": similar_stats(),
+        "neo4j_drivers": pool_stats(),
+    }
@@ -0,0 +1,70 @@
+import os
+import threading
+import time
+
+from app.graph_version import current_version, graph_key
+
+# -----------------------------
+# Defaults
+# -----------------------------
+SCHEMA_TTL_SECONDS = int(os.getenv("NLP_SCHEMA_TTL_SECONDS", "600"))
+
+# (uri, database) -> {"schema", "version", "expires_at"}
+_snapshots = {}
+_lock = threading.Lock()
+_key_locks = {}
+
+
+def _key_lock(key):
+    with _lock:
+        return _key_locks.setdefault(key, threading.Lock())
+
+
+def get_schema(uri: str, database: str, extract_fn):
+    """
+    Cached graph schema for (uri, database).
+
+    extract_fn() is only called on a miss: first use, TTL expiry, or after a
+    KG load bumped the graph version. Concurrent misses for the same graph
+    wait for a single extraction instead of all hitting Neo4j.
+    """
+    key = graph_key(uri, database)
+
+    snapshot = _fresh(key, uri, database)
+    if snapshot is not None:
+        return snapshot
+
+    with _key_lock(key):
+        snapshot = _fresh(key, uri, database)
+        if snapshot is not None:
+            return snapshot
+
+        version = current_version(uri, database)
+        schema = extract_fn()
+        with _lock:
+            _snapshots[key] = {
+                "schema": schema,
+                "version": version,
+                "expires_at": time.monotonic() + SCHEMA_TTL_SECONDS,
+            }
+        return schema
+
+
+def _fresh(key, uri, database):
+    with _lock:
+        entry = _snapshots.get(key)
+    if entry is None:
+        return None
+    if entry["expires_at"] < time.monotonic():
+        return None
+    if entry["version"] != current_version(uri, database):
+        return None
+    return entry["schema"]
+
+
+def invalidate(uri: str | None = None, database: str | None = None):
+    with _lock:
+        if uri is None:
+            _snapshots.clear()
+        else:
+            _snapshots.pop(graph_key(uri, database), None)
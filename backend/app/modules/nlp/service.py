@@ -1,15 +1,27 @@
+import asyncio
 import os
 import json
-from typing import Any, Dict, List
+import time
+from contextlib import closing
+from typing import Any, AsyncIterator, Dict, Iterator, List, Tuple
 
-from neo4j import GraphDatabase
 from dotenv import load_dotenv
 
 from .groq_cypher import GroqCypherGenerator
-from .neo4j_executor import Neo4jExecutor
+from .neo4j_executor import AsyncNeo4jExecutor, Neo4jExecutor
 from .neo4j_schema_extractor import Neo4jSchemaExtractor1
 from .cypher_utils import sanitize_cypher, validate_cypher, normalize_return, fix_order_by_alias,fix_aggregate_where
 from .groq_client import GroqClient
+from .schema_cache import get_schema
+from .query_cache import (
+    CYPHER_CACHE,
+    RESULT_CACHE,
+    cypher_key,
+    normalize_question,
+    result_key,
+)
+from .similar_questions import find_similar, few_shot, remember, reusable
+from app.neo4j_pool import async_lease_driver, lease_driver
 
 load_dotenv()
 
@@ -24,16 +36,11 @@ def _safe_json(obj: Any):
         return str(obj)
 
 
-def summarize_answer(question: str, data: List[Dict[str, Any]]) -> str:
-    """
-    Uses Groq to convert raw Neo4j result into a clean chatbot summary.
-    """
-    client = GroqClient(GROQ_API_KEY)
-
+def _summary_prompt(question: str, data: List[Dict[str, Any]]) -> str:
     # keep only first 20 rows for summary
     sample = data[:20]
 
-    prompt = f"""
+    return f"""
 You are a chatbot assistant.
 User asked: {question}
 
@@ -49,7 +56,101 @@ Rules:
 - If results contain counts, explain top results clearly.
 """
 
-    return client.chat(prompt).strip()
+
+def summarize_answer(question: str, data: List[Dict[str, Any]]) -> str:
+    """
+    Uses Groq to convert raw Neo4j result into a clean chatbot summary.
+    """
+    client = GroqClient(GROQ_API_KEY)
+    return client.chat(_summary_prompt(question, data)).strip()
+
+
+def stream_summary(question: str, data: List[Dict[str, Any]]) -> Iterator[str]:
+    """
+    Same summary, yielded token by token as Groq produces it.
+    """
+    client = GroqClient(GROQ_API_KEY)
+    yield from client.stream(_summary_prompt(question, data))
+
+
+def _clean_cypher(raw_cypher: str) -> str:
+    clean_cypher = sanitize_cypher(raw_cypher)
+    clean_cypher = fix_aggregate_where(clean_cypher)
+    validate_cypher(clean_cypher)
+
+    normalized = normalize_return(clean_cypher)
+    return fix_order_by_alias(normalized)
+
+
+def _schema_extractor(req):
+    def extract_schema():
+        extractor = Neo4jSchemaExtractor1(
+            uri=req.neo4j_uri,
+            user=req.neo4j_user,
+            password=req.neo4j_password,
+            database=req.neo4j_database
+        )
+        try:
+            return extractor.extract()
+        finally:
+            extractor.close()
+
+    return extract_schema
+
+
+# -----------------------------
+# Cache steps (shared by the sync and async pipelines)
+# -----------------------------
+def _cached_cypher(ckey):
+    """
+    Cypher stored for this question + schema, or None.
+    """
+    cached = CYPHER_CACHE.get(ckey)
+    if cached is None:
+        return None
+    CYPHER_CACHE.record_saved(cached["llm_seconds"])
+    return cached["cypher"]
+
+
+def _reuse_similar(question: str, similar: list):
+    """
+    (cypher, llm_seconds) of the closest answered question when its Cypher
+    can be reused as-is, else None.
+    """
+    if not similar or not reusable(question, similar[0]):
+        return None
+    CYPHER_CACHE.record_saved(similar[0]["llm_seconds"])
+    return similar[0]["cypher"], similar[0]["llm_seconds"]
+
+
+def _store_cypher(ckey, cypher: str, llm_seconds: float):
+    # only validated LLM Cypher is cached: a reused "similar" query must be
+    # re-checked against the next question's literals
+    CYPHER_CACHE.put(ckey, {"cypher": cypher, "llm_seconds": llm_seconds})
+
+
+def _cached_result(rkey, question: str):
+    """
+    (rows, summary) stored for this Cypher. summary is None when the rows
+    were summarised for another phrasing (it has to be written again);
+    both are None on a miss.
+    """
+    entry = RESULT_CACHE.get(rkey)
+    if entry is None:
+        return None, None
+    if entry["question"] != normalize_question(question):
+        return entry["rows"], None
+    RESULT_CACHE.record_saved(entry["llm_seconds"])
+    return entry["rows"], entry["summary"]
+
+
+def _store_result(rkey, question: str, rows, summary: str, llm_seconds: float):
+    RESULT_CACHE.put(rkey, {
+        "rows": rows,
+        "question": normalize_question(question),
+        "summary": summary,
+        "llm_seconds": llm_seconds,
+    })
 
 
 def ask_question(req) -> Dict[str, Any]:
@@ -61,56 +162,195 @@ def ask_question(req) -> Dict[str, Any]:
       - neo4j_database
       - question
     """
+    with closing(ask_question_events(req)) as events:
+        for event, data in events:
+            if event == "done":
+                return {
+                    "answer": data["answer"],      # ✅ only chatbot summary
+                        # optional: keep for frontend table
+                }
 
-    # 1) Connect to Neo4j
-    driver = GraphDatabase.driver(
+
+def ask_question_events(req) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    The /nlp pipeline as a stream of (event, data) stages:
+      start -> schema -> cypher -> rows -> token* -> done
+    ask_question() drains it; /nlp/ask/stream sends it as SSE.
+    """
+    yield "start", {"question": req.question}
+
+    # built before the lease: it raises when GROQ_API_KEY is missing
+    cypher_generator = GroqCypherGenerator(GROQ_API_KEY)
+    extract_schema = _schema_extractor(req)
+
+    # 1) Connect to Neo4j (shared, pooled driver)
+    neo4j_lease = lease_driver(
         req.neo4j_uri,
-        auth=(req.neo4j_user, req.neo4j_password)
+        req.neo4j_user,
+        req.neo4j_password,
+        req.neo4j_database
     )
 
-    executor = Neo4jExecutor(
-        uri=req.neo4j_uri,
-        user=req.neo4j_user,
-        password=req.neo4j_password,
-        database=req.neo4j_database
-    )
+    executor = Neo4jExecutor(neo4j_lease.driver, req.neo4j_database)
 
-    extractor = Neo4jSchemaExtractor1(
-        uri=req.neo4j_uri,
-        user=req.neo4j_user,
-        password=req.neo4j_password,
-        database=req.neo4j_database
-    )
+    try:
+        # 2) Extract schema (cached per graph, refreshed after /kg/load)
+        schema = get_schema(req.neo4j_uri, req.neo4j_database, extract_schema)
+        yield "schema", {"labels": len(schema.get("schema", {}))}
 
-    cypher_generator = GroqCypherGenerator(GROQ_API_KEY)
+        # 3) Question -> Cypher (cached per normalised question + schema)
+        ckey = cypher_key(req.neo4j_uri, req.neo4j_database, schema, req.question)
+        final_cypher = _cached_cypher(ckey)
 
+        vector = None
+        cypher_source = "cache"
+        if final_cypher is None:
+            # near-duplicate of an answered question: reuse its Cypher, or
+            # at least hand the closest ones to the LLM as examples
+            vector, similar = find_similar(ckey[:2], req.question)
+            reused = _reuse_similar(req.question, similar)
+
+            if reused is not None:
+                final_cypher, llm_seconds = reused
+                cypher_source = "similar"
+            else:
+                started = time.perf_counter()
+                cypher = cypher_generator.generate_cypher(
+                    req.question, schema, examples=few_shot(similar)
+                )
+                llm_seconds = time.perf_counter() - started
+
+                # 4) Clean & validate cypher
+                final_cypher = _clean_cypher(cypher)
+                cypher_source = "llm"
+                _store_cypher(ckey, final_cypher, llm_seconds)
+
+        yield "cypher", {"cypher": final_cypher, "source": cypher_source}
+
+        # 5) Cypher -> rows + summary (cached per graph version)
+        rkey = result_key(req.neo4j_uri, req.neo4j_database, final_cypher)
+        result_data, summary = _cached_result(rkey, req.question)
+
+        if summary is not None:
+            yield "rows", {"count": len(result_data), "cached": True}
+            yield "token", {"text": summary}
+        else:
+            rows_cached = result_data is not None
+            if not rows_cached:
+                result_data = executor.run(final_cypher)
+            yield "rows", {"count": len(result_data), "cached": rows_cached}
+
+            # 6) Summarize (streamed)
+            started = time.perf_counter()
+            parts = []
+            for text in stream_summary(req.question, result_data):
+                parts.append(text)
+                yield "token", {"text": text}
+            summary = "".join(parts).strip()
+            _store_result(rkey, req.question, result_data, summary, time.perf_counter() - started)
+
+        # the Cypher ran: index the question for similar ones later
+        if vector is not None:
+            remember(ckey[:2], req.question, final_cypher, vector, llm_seconds)
+
+        yield "done", {"answer": summary}
+
+    finally:
+        neo4j_lease.close()
+
+
+# -----------------------------
+# Async pipeline (async routes)
+# -----------------------------
+async def astream_summary(question: str, data: List[Dict[str, Any]]) -> AsyncIterator[str]:
+    client = GroqClient(GROQ_API_KEY)
+    async for text in client.astream(_summary_prompt(question, data)):
+        yield text
+
+
+async def aask_question(req) -> Dict[str, Any]:
+    events = aask_question_events(req)
     try:
-        # 2) Extract schema
-        schema = extractor.extract()
+        async for event, data in events:
+            if event == "done":
+                return {"answer": data["answer"]}
+    finally:
+        await events.aclose()
+
+
+async def aask_question_events(req) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    ask_question_events() on the event loop: AsyncGraphDatabase for the
+    query, the async Groq client for both LLM calls. Only the rare schema
+    extraction (cache miss) and the local embedding run in a worker thread.
+    """
+    yield "start", {"question": req.question}
+
+    cypher_generator = GroqCypherGenerator(GROQ_API_KEY)   # before the lease, see above
+
+    neo4j_lease = async_lease_driver(
+        req.neo4j_uri,
+        req.neo4j_user,
+        req.neo4j_password,
+        req.neo4j_database
+    )
+    driver = await neo4j_lease.acquire()
+    executor = AsyncNeo4jExecutor(driver, req.neo4j_database)
+
+    try:
+        schema = await asyncio.to_thread(
+            get_schema, req.neo4j_uri, req.neo4j_database, _schema_extractor(req)
+        )
+        yield "schema", {"labels": len(schema.get("schema", {}))}
+
+        ckey = cypher_key(req.neo4j_uri, req.neo4j_database, schema, req.question)
+        final_cypher = _cached_cypher(ckey)
+
+        vector = None
+        cypher_source = "cache"
+        if final_cypher is None:
+            vector, similar = await asyncio.to_thread(find_similar, ckey[:2], req.question)
+            reused = _reuse_similar(req.question, similar)
+
+            if reused is not None:
+                final_cypher, llm_seconds = reused
+                cypher_source = "similar"
+            else:
+                started = time.perf_counter()
+                cypher = await cypher_generator.agenerate_cypher(
+                    req.question, schema, examples=few_shot(similar)
+                )
+                llm_seconds = time.perf_counter() - started
+                final_cypher = _clean_cypher(cypher)
+                cypher_source = "llm"
+                _store_cypher(ckey, final_cypher, llm_seconds)
 
-        # 3) Generate cypher
-        cypher = cypher_generator.generate_cypher(req.question, schema)
+        yield "cypher", {"cypher": final_cypher, "source": cypher_source}
 
-        # 4) Clean & validate cypher
-        raw_cypher = cypher
-        clean_cypher = sanitize_cypher(raw_cypher)
-        clean_cypher = fix_aggregate_where(clean_cypher)
-        validate_cypher(clean_cypher)
+        rkey = result_key(req.neo4j_uri, req.neo4j_database, final_cypher)
+        result_data, summary = _cached_result(rkey, req.question)
 
-        normalized = normalize_return(clean_cypher)
-        final_cypher = fix_order_by_alias(normalized)
+        if summary is not None:
+            yield "rows", {"count": len(result_data), "cached": True}
+            yield "token", {"text": summary}
+        else:
+            rows_cached = result_data is not None
+            if not rows_cached:
+                result_data = await executor.run(final_cypher)
+            yield "rows", {"count": len(result_data), "cached": rows_cached}
 
-        # 5) Execute query
-        result_data = executor.run(final_cypher)
+            started = time.perf_counter()
+            parts = []
+            async for text in astream_summary(req.question, result_data):
+                parts.append(text)
+                yield "token", {"text": text}
+            summary = "".join(parts).strip()
+            _store_result(rkey, req.question, result_data, summary, time.perf_counter() - started)
 
-        # 6) Summarize
-        summary = summarize_answer(req.question, result_data)
+        if vector is not None:
+            remember(ckey[:2], req.question, final_cypher, vector, llm_seconds)
 
-        return {
-            "answer": summary,      # ✅ only chatbot summary
-                # optional: keep for frontend table
-        }
+        yield "done", {"answer": summary}
 
     finally:
-        driver.close()
-        extractor.close()
+        await neo4j_lease.release()
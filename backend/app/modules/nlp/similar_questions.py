@@ -0,0 +1,181 @@
+import importlib.util
+import os
+import re
+import threading
+
+import numpy as np
+
+from app.modules.nlp.query_cache import normalize_question
+
+# -----------------------------
+# Defaults (override via .env)
+# -----------------------------
+# any sentence-transformers model name or local path; loaded offline only
+EMBEDDING_MODEL = os.getenv("NLP_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+REUSE_THRESHOLD = float(os.getenv("NLP_SIMILAR_REUSE_THRESHOLD", "0.93"))      # skip the LLM
+EXAMPLE_THRESHOLD = float(os.getenv("NLP_SIMILAR_EXAMPLE_THRESHOLD", "0.75"))  # few-shot examples
+MAX_EXAMPLES = int(os.getenv("NLP_SIMILAR_EXAMPLES", "3"))
+MAX_ENTRIES = int(os.getenv("NLP_SIMILAR_MAX_ENTRIES", "5000"))               # per graph
+
+# the local embedding model is an optional dependency; without it the
+# pipeline runs exactly as before
+ENABLED = (
+    os.getenv("NLP_SIMILAR_QUESTIONS", "1") != "0"
+    and importlib.util.find_spec("sentence_transformers") is not None
+)
+
+_LITERALS = re.compile(r"\"[^\"]*\"|'[^']*'|\d+(?:\.\d+)?")
+_CYPHER_STRINGS = re.compile(r"\"((?:[^\"\\]|\\.)*)\"|'((?:[^'\\]|\\.)*)'")
+
+_model = None
+_model_lock = threading.Lock()
+_stats = {"lookups": 0, "reused": 0, "few_shot": 0, "remembered": 0}
+
+
+def _encoder():
+    global _model, ENABLED
+    if _model is not None or not ENABLED:
+        return _model
+
+    with _model_lock:
+        if _model is None and ENABLED:
+            try:
+                from sentence_transformers import SentenceTransformer
+                # never reach out to the hub: the model must already be local
+                _model = SentenceTransformer(EMBEDDING_MODEL, local_files_only=True)
+            except Exception as e:
+                print(f"[NLP] Similar-question cache disabled ({EMBEDDING_MODEL}): {e}")
+                ENABLED = False
+    return _model
+
+
+def embed(question: str):
+    model = _encoder()
+    if model is None:
+        return None
+    vector = model.encode([normalize_question(question)], normalize_embeddings=True)[0]
+    return np.asarray(vector, dtype=np.float32)
+
+
+def literals(question: str) -> list:
+    """
+    Numbers and quoted values: two questions can only share a Cypher query
+    when these match ("top 5" vs "top 10").
+    """
+    return sorted(_LITERALS.findall(normalize_question(question)))
+
+
+# -----------------------------
+# Brute-force index
+# -----------------------------
+class QuestionIndex:
+    """
+    Unit-length question embeddings in one float32 matrix; search is a
+    single matrix-vector product, fine for a few thousand questions.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.vectors = None
+        self.items = []
+        self._lock = threading.Lock()
+
+    def add(self, vector, item: dict):
+        with self._lock:
+            for i, existing in enumerate(self.items):
+                if existing["question"] == item["question"]:
+                    self.items[i] = item
+                    self.vectors[i] = vector
+                    return
+
+            row = vector[np.newaxis, :]
+            self.vectors = row if self.vectors is None else np.vstack([self.vectors, row])
+            self.items.append(item)
+
+            if len(self.items) > self.max_entries:
+                drop = len(self.items) - self.max_entries
+                self.vectors = self.vectors[drop:]
+                self.items = self.items[drop:]
+
+    def search(self, vector, k: int) -> list:
+        with self._lock:
+            if self.vectors is None:
+                return []
+            scores = self.vectors @ vector
+            top = np.argsort(-scores)[:k]
+            return [{**self.items[i], "score": float(scores[i])} for i in top]
+
+
+# (graph, schema fingerprint) -> QuestionIndex
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def _index(scope) -> QuestionIndex:
+    with _indexes_lock:
+        return _indexes.setdefault(scope, QuestionIndex())
+
+
+def find_similar(scope, question: str):
+    """
+    (embedding, matches) for a question; matches are the closest previously
+    answered questions of the same graph and schema, best first.
+    """
+    vector = embed(question)
+    if vector is None:
+        return None, []
+
+    _stats["lookups"] += 1
+    matches = _index(scope).search(vector, max(MAX_EXAMPLES, 1))
+    return vector, [m for m in matches if m["score"] >= EXAMPLE_THRESHOLD]
+
+
+def cypher_strings(cypher: str) -> list:
+    """
+    String literals of a Cypher query ('Paris', "ACME"), unquoted.
+    """
+    return [a or b for a, b in _CYPHER_STRINGS.findall(cypher)]
+
+
+def reusable(question: str, match: dict) -> bool:
+    """
+    A matched Cypher is only reused when the literals agree and every
+    string value it filters on also appears in the new question; the
+    embedding alone cannot tell "customers in Paris" from "... in Lyon".
+    """
+    text = question.lower()
+    ok = (
+        match["score"] >= REUSE_THRESHOLD
+        and match["literals"] == literals(question)
+        and all(s.lower() in text for s in cypher_strings(match["cypher"]))
+    )
+    if ok:
+        _stats["reused"] += 1
+    return ok
+
+
+def few_shot(matches: list) -> list:
+    if matches:
+        _stats["few_shot"] += 1
+    return [{"question": m["question"], "cypher": m["cypher"]} for m in matches[:MAX_EXAMPLES]]
+
+
+def remember(scope, question: str, cypher: str, vector, llm_seconds: float = 0.0):
+    """
+    Adds a question whose Cypher validated and ran.
+    """
+    if vector is None:
+        return
+    _index(scope).add(vector, {
+        "question": normalize_question(question),
+        "cypher": cypher,
+        "literals": literals(question),
+        "llm_seconds": llm_seconds,
+    })
+    _stats["remembered"] += 1
+
+
+def similar_stats() -> dict:
+    with _indexes_lock:
+        entries = sum(len(i.items) for i in _indexes.values())
+    return {"enabled": ENABLED, "model": EMBEDDING_MODEL, "entries": entries, **_stats}
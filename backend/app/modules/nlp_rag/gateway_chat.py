@@ -0,0 +1,64 @@
+from typing import Any
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from app.llm_gateway import DEFAULT_MODEL
+
+_ROLES = {"human": "user", "ai": "assistant", "system": "system"}
+
+
+def _to_groq(messages):
+    return [
+        {"role": _ROLES.get(m.type, "user"), "content": m.content}
+        for m in messages
+    ]
+
+
+class GatewayChatModel(BaseChatModel):
+    """
+    LangChain chat model backed by an LLMGateway, so chains (GraphRAG's
+    GraphCypherQAChain) go through the shared RPM / TPM buckets and the
+    Retry-After backoff instead of calling Groq directly like ChatGroq.
+    """
+
+    gateway: Any
+    model: str = DEFAULT_MODEL
+    temperature: float = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "groq-gateway"
+
+    def _params(self, stop, kwargs):
+        if stop:
+            kwargs = {"stop": stop, **kwargs}
+        return {"model": self.model, "temperature": self.temperature, **kwargs}
+
+    # ---------- sync ----------
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        resp = self.gateway.complete(messages=_to_groq(messages), **self._params(stop, kwargs))
+        content = resp.choices[0].message.content or ""
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        # the limiter and retries apply to opening the stream
+        stream = self.gateway.complete(
+            messages=_to_groq(messages), stream=True, **self._params(stop, kwargs)
+        )
+        for chunk in stream:
+            text = chunk.choices[0].delta.content if chunk.choices else None
+            if not text:
+                continue
+            if run_manager:
+                run_manager.on_llm_new_token(text)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=text))
+
+    # ---------- async ----------
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        resp = await self.gateway.acomplete(messages=_to_groq(messages), **self._params(stop, kwargs))
+        content = resp.choices[0].message.content or ""
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
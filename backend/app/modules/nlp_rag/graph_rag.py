@@ -1,7 +1,18 @@
 import os
-from langchain_community.chains.graph_qa.cypher import GraphCypherQAChain
+import threading
+
+from langchain_community.chains.graph_qa.cypher import GraphCypherQAChain, extract_cypher
 from langchain_community.graphs import Neo4jGraph
-from langchain_groq import ChatGroq
+
+from app.graph_version import current_version
+from app.llm_gateway import get_gateway
+from app.modules.nlp_rag.gateway_chat import GatewayChatModel
+from app.neo4j_pool import lease_driver
+
+NO_ANSWER = (
+    "I don't have enough information in the knowledge graph "
+    "to answer this question."
+)
 
 
 class GraphRAG:
@@ -35,25 +46,46 @@ class GraphRAG:
             url=neo4j_url,
             username=neo4j_user,
             password=neo4j_password,
-            database=neo4j_database   # ✅ THIS WAS MISSING
+            database=neo4j_database,   # ✅ THIS WAS MISSING
+            refresh_schema=False,
         )
 
-        # Load graph schema (metadata only)
-        self.graph.refresh_schema()
+        # run on the shared, pooled driver instead of one driver per session
+        self._lease = lease_driver(neo4j_url, neo4j_user, neo4j_password, neo4j_database)
+        self.graph._driver.close()
+        self.graph._driver = self._lease.driver
+
+        # Load graph schema (metadata only); reloaded after a /kg/load
+        self.uri = neo4j_url
+        self.database = neo4j_database
+        self.schema_version = current_version(neo4j_url, neo4j_database)
+        self._schema_lock = threading.Lock()
+        try:
+            self.graph.refresh_schema()
+        except Exception:
+            self._lease.close()
+            raise
 
         # -------------------------------
         # Groq LLM
         # -------------------------------
-        self.llm = ChatGroq(
+        # every chain call goes through the shared gateway (pool, RPM / TPM
+        # limits, Retry-After backoff; see app/llm_gateway.py)
+        self.llm = GatewayChatModel(
+            gateway=get_gateway(api_key),
             model=model,
             temperature=0,
-            api_key=api_key
         )
 
         # -------------------------------
         # Graph-RAG chain
         # -------------------------------
-        self.chain = GraphCypherQAChain.from_llm(
+        self.chain = self._build_chain()
+
+    def _build_chain(self):
+        # validate_cypher builds its query corrector from the relationship
+        # schema loaded now, so the chain is rebuilt whenever that changes
+        return GraphCypherQAChain.from_llm(
             llm=self.llm,
             graph=self.graph,
             verbose=True,
@@ -62,13 +94,61 @@ class GraphRAG:
             allow_dangerous_requests=True  # ⚠️ keep only for trusted users
         )
 
+    def close(self):
+        # releases the shared driver; never close self.graph (it would close it for everyone)
+        self._lease.close()
+
+    def _refresh_if_stale(self):
+        # one GraphRAG serves many sessions for a long time (see session_store)
+        version = current_version(self.uri, self.database)
+        if version == self.schema_version:
+            return
+        with self._schema_lock:
+            if version != self.schema_version:
+                self.graph.refresh_schema()
+                # new schema prompt and cypher_query_corrector; requests
+                # already running keep the chain they started with
+                self.chain = self._build_chain()
+                self.schema_version = version
+
     def ask(self, question: str) -> str:
+        self._refresh_if_stale()
         response = self.chain.invoke({"query": question})
 
         if not response.get("result"):
-            return (
-                "I don't have enough information in the knowledge graph "
-                "to answer this question."
-            )
+            return NO_ANSWER
 
         return response["result"]
+
+    def ask_events(self, question: str):
+        """
+        Same steps as the chain, as (event, data) stages so the answer can
+        be streamed: cypher -> rows -> token* -> done.
+        """
+        self._refresh_if_stale()
+        chain = self.chain
+
+        cypher = chain.cypher_generation_chain.invoke(
+            {"question": question, "schema": chain.graph_schema}
+        )
+        cypher = extract_cypher(getattr(cypher, "content", cypher))
+        if chain.cypher_query_corrector:
+            cypher = chain.cypher_query_corrector(cypher)
+        yield "cypher", {"cypher": cypher}
+
+        context = self.graph.query(cypher)[: chain.top_k] if cypher else []
+        yield "rows", {"count": len(context)}
+
+        parts = []
+        for chunk in chain.qa_chain.stream({"question": question, "context": context}):
+            text = getattr(chunk, "content", chunk)
+            if isinstance(text, str) and text:
+                parts.append(text)
+                yield "token", {"text": text}
+
+        answer = "".join(parts).strip()
+        if not answer:
+            answer = NO_ANSWER
+            yield "token", {"text": answer}
+
+        yield "done", {"answer": answer}
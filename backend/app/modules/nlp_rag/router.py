@@ -14,10 +14,12 @@
 #     return ask_question(q.question)
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import os
 
-from .service import init_rag, ask_question
+from .service import init_rag, ask_question, ask_question_events, rag_sessions
+from app.sse import SSE_HEADERS, sse_stream
 
 router = APIRouter(prefix="/nlp-rag", tags=["NLP-RAG"])
 
@@ -56,3 +58,26 @@ def init(req: InitRAGRequest):
 def ask(q: Question):
     return ask_question(q.session_id, q.question)
 
+
+
+@router.post("/ask/stream")
+def ask_stream(q: Question):
+    """
+    Server-Sent Events: start, cypher, rows, token (answer text as Groq
+    produces it), done - or error.
+    """
+    try:
+        events = ask_question_events(q.session_id, q.question)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return StreamingResponse(
+        sse_stream(events),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+@router.get("/sessions")
+def sessions():
+    return rag_sessions.stats()
@@ -30,11 +30,15 @@
 #     rag_instance = get_rag()
 #     result = rag_instance.ask(question)
 #     return {"question": question, "result": result}
+import hashlib
 from typing import Optional
 from .graph_rag import GraphRAG
+from .session_store import RAGSessionStore
+from app.neo4j_pool import driver_key
+
+# bounded, expiring session store; sessions on the same database share one GraphRAG
+rag_sessions = RAGSessionStore()
 
-# in-memory session store (simple + effective)
-rag_instances = {}
 
 def init_rag(
     session_id: str,
@@ -44,17 +48,24 @@ def init_rag(
     neo4j_database: str,
     api_key: str,
 ):
-    rag_instances[session_id] = GraphRAG(
-        neo4j_url=neo4j_uri,
-        neo4j_user=neo4j_user,
-        neo4j_password=neo4j_password,
-        neo4j_database=neo4j_database,
-        api_key=api_key,
+    api_key_hash = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+    key = driver_key(neo4j_uri, neo4j_user, neo4j_password, neo4j_database) + (api_key_hash,)
+
+    rag_sessions.init(
+        session_id,
+        key,
+        lambda: GraphRAG(
+            neo4j_url=neo4j_uri,
+            neo4j_user=neo4j_user,
+            neo4j_password=neo4j_password,
+            neo4j_database=neo4j_database,
+            api_key=api_key,
+        ),
     )
 
 
 def ask_question(session_id: str, question: str):
-    rag = rag_instances.get(session_id)
+    rag = rag_sessions.get(session_id)
 
     if not rag:
         raise ValueError("RAG not initialized for this session")
@@ -63,3 +74,16 @@ def ask_question(session_id: str, question: str):
         "question": question,
         "result": rag.ask(question),
     }
+
+
+def ask_question_events(session_id: str, question: str):
+    rag = rag_sessions.get(session_id)
+
+    if not rag:
+        raise ValueError("RAG not initialized for this session")
+
+    def events():
+        yield "start", {"question": question}
+        yield from rag.ask_events(question)
+
+    return events()
@@ -0,0 +1,137 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# -----------------------------
+# Defaults (override via .env)
+# -----------------------------
+RAG_MAX_SESSIONS = int(os.getenv("RAG_MAX_SESSIONS", "200"))
+RAG_SESSION_TTL_SECONDS = int(os.getenv("RAG_SESSION_TTL_SECONDS", "1800"))
+
+
+class RAGSessionStore:
+    """
+    session_id -> shared GraphRAG, bounded (LRU, RAG_MAX_SESSIONS) and
+    expiring (idle for RAG_SESSION_TTL_SECONDS).
+
+    Sessions pointing at the same Neo4j database share one GraphRAG (graph,
+    schema, LLM and chain), so only the first /init of a database pays for
+    the connection and refresh_schema(). A GraphRAG is closed once its last
+    session is evicted, expired or re-initialised elsewhere.
+    """
+
+    def __init__(self, max_sessions: int = RAG_MAX_SESSIONS,
+                 ttl_seconds: int = RAG_SESSION_TTL_SECONDS):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+
+        self._sessions = OrderedDict()   # session_id -> {"key", "last_used"}
+        self._shared = {}                # key -> {"rag", "sessions"}
+        self._lock = threading.Lock()
+        self._build_locks = {}
+
+        self.builds = 0
+        self.reuses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _build_lock(self, key):
+        with self._lock:
+            return self._build_locks.setdefault(key, threading.Lock())
+
+    # ---------- internal (caller holds _lock) ----------
+
+    def _detach(self, session_id, closing: list):
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return
+        shared = self._shared.get(session["key"])
+        if shared is None:
+            return
+        shared["sessions"] -= 1
+        if shared["sessions"] <= 0:
+            del self._shared[session["key"]]
+            closing.append(shared["rag"])
+
+    def _expire(self, closing: list):
+        deadline = time.monotonic() - self.ttl_seconds
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session["last_used"] >= deadline:
+                break
+            self._detach(session_id, closing)
+            self.expirations += 1
+
+    @staticmethod
+    def _close(closing: list):
+        for rag in closing:
+            try:
+                rag.close()
+            except Exception:
+                pass
+
+    # ---------- public ----------
+
+    def init(self, session_id: str, key, build):
+        """
+        Binds session_id to the GraphRAG for `key`, calling build() only
+        when no live session shares it yet.
+        """
+        with self._build_lock(key):
+            with self._lock:
+                shared = self._shared.get(key)
+                if shared is not None:
+                    # pinned for this session, so it cannot be closed meanwhile
+                    shared["sessions"] += 1
+                    self.reuses += 1
+
+            if shared is None:
+                shared = {"rag": build(), "sessions": 1}
+                with self._lock:
+                    self._shared[key] = shared
+                    self.builds += 1
+
+            closing = []
+            with self._lock:
+                self._detach(session_id, closing)
+                self._sessions[session_id] = {"key": key, "last_used": time.monotonic()}
+
+                self._expire(closing)
+                while len(self._sessions) > self.max_sessions:
+                    self._detach(next(iter(self._sessions)), closing)
+                    self.evictions += 1
+
+        self._close(closing)
+
+    def get(self, session_id: str):
+        closing = []
+        with self._lock:
+            self._expire(closing)
+            session = self._sessions.get(session_id)
+            rag = None
+            if session is not None:
+                session["last_used"] = time.monotonic()
+                self._sessions.move_to_end(session_id)
+                rag = self._shared[session["key"]]["rag"]
+        self._close(closing)
+        return rag
+
+    def remove(self, session_id: str):
+        closing = []
+        with self._lock:
+            self._detach(session_id, closing)
+        self._close(closing)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "ttl_seconds": self.ttl_seconds,
+                "shared_graphs": len(self._shared),
+                "builds": self.builds,
+                "reuses": self.reuses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -0,0 +1,326 @@
+import asyncio
+import atexit
+import hashlib
+import os
+import threading
+import time
+import weakref
+
+from neo4j import AsyncGraphDatabase, GraphDatabase
+
+# -----------------------------
+# Defaults (override via .env)
+# -----------------------------
+NEO4J_POOL_SIZE = int(os.getenv("NEO4J_POOL_SIZE", "100"))              # connections per driver
+NEO4J_ACQUIRE_TIMEOUT = float(os.getenv("NEO4J_ACQUIRE_TIMEOUT", "30"))  # wait for a free connection
+NEO4J_CONNECTION_LIFETIME = float(os.getenv("NEO4J_CONNECTION_LIFETIME", "3600"))
+NEO4J_LIVENESS_CHECK = float(os.getenv("NEO4J_LIVENESS_CHECK", "30"))    # ping connections idle longer than this
+NEO4J_HEALTH_CHECK_SECONDS = float(os.getenv("NEO4J_HEALTH_CHECK_SECONDS", "60"))
+NEO4J_DRIVER_IDLE_SECONDS = float(os.getenv("NEO4J_DRIVER_IDLE_SECONDS", "900"))
+
+
+class _Entry:
+    def __init__(self, driver):
+        self.driver = driver
+        self.refs = 0
+        self.retired = False
+        self.last_used = time.monotonic()
+        self.checked_at = time.monotonic()
+
+
+# -----------------------------
+# Process-wide registry
+# -----------------------------
+_drivers = {}
+_lock = threading.Lock()
+
+
+def driver_key(uri: str, user: str, password: str, database: str | None) -> tuple:
+    # the password is part of the key (hashed) so a wrong password never
+    # gets handed an already-authenticated driver
+    secret = hashlib.sha256(f"{user}\0{password}".encode("utf-8")).hexdigest()[:16]
+    return (uri or "").strip().rstrip("/"), user, database or "neo4j", secret
+
+
+def _new_driver(uri, user, password):
+    driver = GraphDatabase.driver(
+        uri,
+        auth=(user, password),
+        max_connection_pool_size=NEO4J_POOL_SIZE,
+        connection_acquisition_timeout=NEO4J_ACQUIRE_TIMEOUT,
+        max_connection_lifetime=NEO4J_CONNECTION_LIFETIME,
+        liveness_check_timeout=NEO4J_LIVENESS_CHECK,
+        keep_alive=True,
+    )
+    try:
+        driver.verify_connectivity()
+    except Exception:
+        driver.close()
+        raise
+    return driver
+
+
+def _close_quietly(driver):
+    try:
+        driver.close()
+    except Exception:
+        pass
+
+
+def _evict_idle():
+    """
+    Closes drivers nobody holds that were not used for
+    NEO4J_DRIVER_IDLE_SECONDS.
+    """
+    now = time.monotonic()
+    idle = []
+    with _lock:
+        for key, entry in list(_drivers.items()):
+            if entry.refs == 0 and now - entry.last_used > NEO4J_DRIVER_IDLE_SECONDS:
+                idle.append(_drivers.pop(key).driver)
+    for driver in idle:
+        _close_quietly(driver)
+
+
+def _retire(key, entry):
+    """
+    Drops a driver from the registry; it is closed once the last holder
+    releases it.
+    """
+    with _lock:
+        if _drivers.get(key) is entry:
+            del _drivers[key]
+        entry.retired = True
+        close_now = entry.refs == 0
+    if close_now:
+        _close_quietly(entry.driver)
+
+
+def _checkout(key, driver=None):
+    # caller holds _lock; registers `driver` when there is no entry yet
+    entry = _drivers.get(key)
+    if entry is None and driver is not None:
+        entry = _Entry(driver)
+        _drivers[key] = entry
+    if entry is not None:
+        entry.refs += 1
+        entry.last_used = time.monotonic()
+    return entry
+
+
+def _acquire(key, uri, user, password):
+    _evict_idle()
+
+    with _lock:
+        entry = _checkout(key)
+
+    if entry is None:
+        # connect outside the lock; if two requests race, the loser closes its driver
+        driver = _new_driver(uri, user, password)
+        with _lock:
+            entry = _checkout(key, driver)
+        if entry.driver is not driver:
+            _close_quietly(driver)
+        entry.checked_at = time.monotonic()
+
+    if time.monotonic() - entry.checked_at > NEO4J_HEALTH_CHECK_SECONDS:
+        try:
+            entry.driver.verify_connectivity()
+            entry.checked_at = time.monotonic()
+        except Exception:
+            _release(entry)
+            _retire(key, entry)
+            raise
+
+    return entry
+
+
+def _release(entry):
+    with _lock:
+        entry.refs -= 1
+        entry.last_used = time.monotonic()
+        close_now = entry.retired and entry.refs == 0
+    if close_now:
+        _close_quietly(entry.driver)
+
+
+class DriverLease:
+    """
+    A shared driver for (uri, user, database) from the process-wide pool.
+
+    Use it as a context manager for one request
+    (`with lease_driver(...) as driver:`), or keep it and call close() when
+    a long-lived holder (a RAG session) goes away. close() releases the
+    lease; the driver itself stays open for the next caller until it is
+    idle for NEO4J_DRIVER_IDLE_SECONDS.
+    """
+
+    def __init__(self, uri: str, user: str, password: str, database: str | None = None):
+        self.key = driver_key(uri, user, password, database)
+        self.database = database
+        self._entry = _acquire(self.key, uri, user, password)
+        self._released = False
+
+    @property
+    def driver(self):
+        return self._entry.driver
+
+    def close(self):
+        if not self._released:
+            self._released = True
+            _release(self._entry)
+
+    def __enter__(self):
+        return self.driver
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def lease_driver(uri: str, user: str, password: str, database: str | None = None) -> DriverLease:
+    return DriverLease(uri, user, password, database)
+
+
+def pool_stats() -> list:
+    now = time.monotonic()
+    with _lock:
+        return [
+            {
+                "uri": key[0],
+                "user": key[1],
+                "database": key[2],
+                "holders": entry.refs,
+                "idle_seconds": round(now - entry.last_used, 1),
+            }
+            for key, entry in _drivers.items()
+        ]
+
+
+def close_all():
+    with _lock:
+        entries = list(_drivers.values())
+        _drivers.clear()
+    for entry in entries:
+        entry.retired = True
+        _close_quietly(entry.driver)
+
+
+atexit.register(close_all)
+
+
+# -----------------------------
+# Async drivers (one registry per event loop)
+# -----------------------------
+_async_drivers = weakref.WeakKeyDictionary()   # loop -> {key: _Entry}
+
+
+def _loop_drivers() -> dict:
+    loop = asyncio.get_running_loop()
+    with _lock:
+        return _async_drivers.setdefault(loop, {})
+
+
+async def _new_async_driver(uri, user, password):
+    driver = AsyncGraphDatabase.driver(
+        uri,
+        auth=(user, password),
+        max_connection_pool_size=NEO4J_POOL_SIZE,
+        connection_acquisition_timeout=NEO4J_ACQUIRE_TIMEOUT,
+        max_connection_lifetime=NEO4J_CONNECTION_LIFETIME,
+        liveness_check_timeout=NEO4J_LIVENESS_CHECK,
+        keep_alive=True,
+    )
+    try:
+        await driver.verify_connectivity()
+    except Exception:
+        await driver.close()
+        raise
+    return driver
+
+
+class AsyncDriverLease:
+    """
+    Async counterpart of DriverLease for the running event loop:
+
+        async with async_lease_driver(uri, user, password, db) as driver:
+            ...
+
+    Entries live on one loop, so no locking is needed between coroutines
+    beyond the connect race handled below.
+    """
+
+    def __init__(self, uri: str, user: str, password: str, database: str | None = None):
+        self.uri = uri
+        self.user = user
+        self.password = password
+        self.key = driver_key(uri, user, password, database)
+        self._entry = None
+
+    async def acquire(self):
+        drivers = _loop_drivers()
+        now = time.monotonic()
+
+        for key, entry in list(drivers.items()):
+            if entry.refs == 0 and now - entry.last_used > NEO4J_DRIVER_IDLE_SECONDS:
+                del drivers[key]
+                await entry.driver.close()
+
+        entry = drivers.get(self.key)
+        if entry is None:
+            driver = await _new_async_driver(self.uri, self.user, self.password)
+            entry = drivers.get(self.key)
+            if entry is None:
+                entry = drivers[self.key] = _Entry(driver)
+            else:
+                await driver.close()
+
+        entry.refs += 1
+        entry.last_used = time.monotonic()
+        self._entry = entry
+
+        if entry.last_used - entry.checked_at > NEO4J_HEALTH_CHECK_SECONDS:
+            try:
+                await entry.driver.verify_connectivity()
+                entry.checked_at = time.monotonic()
+            except Exception:
+                await self.release()
+                if drivers.get(self.key) is entry:
+                    del drivers[self.key]
+                entry.retired = True
+                if entry.refs == 0:
+                    await entry.driver.close()
+                raise
+
+        return entry.driver
+
+    async def release(self):
+        entry, self._entry = self._entry, None
+        if entry is None:
+            return
+        entry.refs -= 1
+        entry.last_used = time.monotonic()
+        if entry.retired and entry.refs == 0:
+            await entry.driver.close()
+
+    async def __aenter__(self):
+        return await self.acquire()
+
+    async def __aexit__(self, *exc):
+        await self.release()
+
+
+def async_lease_driver(uri: str, user: str, password: str,
+                       database: str | None = None) -> AsyncDriverLease:
+    return AsyncDriverLease(uri, user, password, database)
+
+
+async def aclose_all():
+    """
+    Closes the running loop's async drivers (app shutdown).
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        drivers = _async_drivers.pop(loop, {})
+    for entry in drivers.values():
+        entry.retired = True
+        await entry.driver.close()
@@ -0,0 +1,43 @@
+import json
+
+# -----------------------------
+# Server-Sent Events
+# -----------------------------
+# proxies (nginx) must not buffer the stream, or nothing arrives until the end
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def sse_stream(events):
+    """
+    Formats an (event, data) generator as SSE; a failure mid-stream is sent
+    as an `error` event since the 200 status is already on the wire.
+    """
+    try:
+        for event, data in events:
+            yield sse_event(event, data)
+    except Exception as e:
+        yield sse_event("error", {"detail": str(e)})
+    finally:
+        close = getattr(events, "close", None)
+        if close:
+            close()
+
+
+async def asse_stream(events):
+    """
+    sse_stream() for an async (event, data) generator.
+    """
+    try:
+        async for event, data in events:
+            yield sse_event(event, data)
+    except Exception as e:
+        yield sse_event("error", {"detail": str(e)})
+    finally:
+        await events.aclose()
@@ -0,0 +1,138 @@
+"""
+Postgres extraction benchmark: COPY text stream vs. the named-cursor path.
+
+    cd backend
+    python -m benchmarks.bench_pg_extraction --password ... --generate
+
+--generate (re)creates --schema.--table with --rows rows (default 1M) of
+typical column types (int, bigint, text, varchar, numeric, double,
+boolean, timestamptz, date). Both paths read the same columns through
+pg_reader.stream_table and consume every row; rows/sec and cells/sec are
+printed for each (best of --repeat), with the peak RSS sampled during the runs.
+"""
+
+import argparse
+import time
+
+import psycopg2
+
+from app.modules.Kg.pg_reader import RSSSampler, iter_rows, stream_table
+
+COLUMNS = {
+    "id": "integer",
+    "account_id": "bigint",
+    "name": "text",
+    "email": "character varying",
+    "balance": "numeric",
+    "score": "double precision",
+    "active": "boolean",
+    "created_at": "timestamp with time zone",
+    "birth_date": "date",
+}
+
+
+# -----------------------------
+# Table generation
+# -----------------------------
+def generate(pg, schema, table, rows):
+    with pg.cursor() as cur:
+        cur.execute(f'CREATE SCHEMA IF NOT EXISTS "{schema}"')
+        cur.execute(f'DROP TABLE IF EXISTS "{schema}"."{table}"')
+        cur.execute(f"""
+            CREATE TABLE "{schema}"."{table}" (
+                id integer PRIMARY KEY,
+                account_id bigint,
+                name text,
+                email varchar(200),
+                balance numeric(12, 2),
+                score double precision,
+                active boolean,
+                created_at timestamptz,
+                birth_date date
+            )
+        """)
+        started = time.perf_counter()
+        cur.execute(f"""
+            INSERT INTO "{schema}"."{table}"
+            SELECT
+                i,
+                i::bigint * 7919,
+                'name ' || i,
+                CASE WHEN i % 10 = 0 THEN NULL ELSE 'user' || i || '@example.com' END,
+                (i % 100000) / 100.0,
+                random(),
+                i % 2 = 0,
+                now() - (i || ' seconds')::interval,
+                date '1950-01-01' + (i % 20000)
+            FROM generate_series(1, %s) AS i
+        """, (rows,))
+        cur.execute(f'ANALYZE "{schema}"."{table}"')
+    pg.commit()
+    print(f"[BENCH] Generated {rows} rows in {time.perf_counter() - started:.1f}s")
+
+
+# -----------------------------
+# Runner
+# -----------------------------
+def run(pg, schema, table, method, batch_size):
+    started = time.perf_counter()
+    with RSSSampler() as rss:
+        colnames, batches = stream_table(
+            pg, schema, table,
+            columns=list(COLUMNS),
+            datatypes=COLUMNS,
+            batch_size=batch_size,
+            method=method,
+        )
+        rows = 0
+        for _ in iter_rows(batches):
+            rows += 1
+    seconds = time.perf_counter() - started
+    pg.rollback()
+    return rows, len(colnames), seconds, rss.peak_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=5432)
+    parser.add_argument("--database", default="postgres")
+    parser.add_argument("--user", default="postgres")
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--schema", default="public")
+    parser.add_argument("--table", default="kg_extract_bench")
+    parser.add_argument("--generate", action="store_true")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--methods", default="cursor,copy")
+    args = parser.parse_args()
+
+    pg = psycopg2.connect(
+        host=args.host,
+        port=args.port,
+        database=args.database,
+        user=args.user,
+        password=args.password,
+    )
+    try:
+        if args.generate:
+            generate(pg, args.schema, args.table, args.rows)
+
+        print(f"{'method':<8}{'rows':>10}{'best s':>9}{'rows/s':>12}{'cells/s':>13}{'peak MB':>9}")
+        for method in args.methods.split(","):
+            best = peak = None
+            for _ in range(args.repeat):
+                rows, cols, seconds, rss = run(pg, args.schema, args.table, method, args.batch_size)
+                best = seconds if best is None else min(best, seconds)
+                peak = rss if peak is None or rss is None else max(peak, rss)
+            print(
+                f"{method:<8}{rows:>10}{best:>9.2f}"
+                f"{rows / best:>12,.0f}{rows * cols / best:>13,.0f}{peak if peak is not None else '-':>9}"
+            )
+    finally:
+        pg.close()
+
+
+if __name__ == "__main__":
+    main()
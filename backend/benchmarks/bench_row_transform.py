@@ -0,0 +1,109 @@
+"""
+Row transform benchmark: compiled per-table RowTransform (positional rows)
+vs. the previous per-row {"pk", "props"} dict with neo4j_safe() on every cell.
+
+    cd backend
+    python -m benchmarks.bench_row_transform --rows 1000000
+
+Rows are generated in memory with the types psycopg2 returns for a typical
+table (int, text, Decimal, float, bool, datetime, date, NULLs) and
+transformed in --batch-size batches into NodeLoader rows; no database is
+involved. cells/sec is printed for both (best of --repeat). --json adds a
+jsonb column (dicts), which the legacy path passed through unconverted.
+"""
+
+import argparse
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from app.modules.Kg.row_transform import RowTransform, neo4j_safe
+
+DATATYPES = {
+    "id": "integer",
+    "name": "text",
+    "email": "character varying",
+    "balance": "numeric",
+    "score": "double precision",
+    "active": "boolean",
+    "created_at": "timestamp with time zone",
+    "birth_date": "date",
+    "discount": "numeric",
+}
+
+
+def generate(rows, with_json=False):
+    base = datetime(2024, 1, 1)
+    return [
+        (
+            i,
+            f"name {i}",
+            None if i % 10 == 0 else f"user{i}@example.com",
+            Decimal(i % 100000) / 100,
+            i / 7,
+            i % 2 == 0,
+            base + timedelta(seconds=i),
+            date(1950, 1, 1) + timedelta(days=i % 20000),
+            None if i % 3 else Decimal("0.15"),
+        ) + (({"tier": i % 5, "tags": ["a", "b"]},) if with_json else ())
+        for i in range(rows)
+    ]
+
+
+# -----------------------------
+# Before / after
+# -----------------------------
+def legacy(batch, colnames, prop_names, pk_idx):
+    out = []
+    for r in batch:
+        out.append({
+            "pk": neo4j_safe(r[pk_idx]),
+            "props": {prop: neo4j_safe(v) for prop, v in zip(prop_names, r)},
+        })
+    return out
+
+
+def compiled(transform):
+    def run(batch, colnames, prop_names, pk_idx):
+        return transform.rows(batch)
+    return run
+
+
+def time_it(fn, batches, colnames, prop_names, pk_idx):
+    started = time.perf_counter()
+    for batch in batches:
+        fn(batch, colnames, prop_names, pk_idx)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    datatypes = dict(DATATYPES)
+    if args.json:
+        datatypes["attributes"] = "jsonb"
+    colnames = list(datatypes)
+    prop_names = [c.title().replace("_", "") for c in colnames]
+    rows = generate(args.rows, args.json)
+    batches = [rows[i:i + args.batch_size] for i in range(0, len(rows), args.batch_size)]
+    cells = args.rows * len(colnames)
+
+    modes = {
+        "legacy": legacy,
+        "compiled": compiled(RowTransform(colnames, datatypes)),
+    }
+
+    print(f"{args.rows} rows x {len(colnames)} columns, batch {args.batch_size}\n")
+    print(f"{'mode':<10}{'best s':>9}{'cells/s':>14}")
+    for name, fn in modes.items():
+        best = min(time_it(fn, batches, colnames, prop_names, 0) for _ in range(args.repeat))
+        print(f"{name:<10}{best:>9.2f}{cells / best:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Schema extraction benchmark: count-store metadata vs. sampling vs. the old
+per-label relationship scan, on a generated graph.
+
+    cd backend
+    python -m benchmarks.bench_schema_extraction --password ... --generate
+
+--generate builds --relationships relationships (default 10M) between
+--people Person and --companies Company nodes plus a sprinkling of City
+nodes, server-side with CALL { } IN TRANSACTIONS, in --database (which
+must be a scratch database: it is wiped first).
+"""
+
+import argparse
+import statistics
+import time
+
+from neo4j import GraphDatabase
+
+from app.modules.nlp.neo4j_schema_extractor import Neo4jSchemaExtractor1
+
+
+# -----------------------------
+# Graph generation
+# -----------------------------
+def generate(driver, database, people, companies, relationships, batch):
+    with driver.session(database=database) as session:
+        print("[BENCH] Wiping database...")
+        session.run(f"""
+            MATCH (n) CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF {batch} ROWS
+        """).consume()
+
+        session.run("CREATE INDEX bench_person IF NOT EXISTS FOR (n:Person) ON (n.id)").consume()
+        session.run("CREATE INDEX bench_company IF NOT EXISTS FOR (n:Company) ON (n.id)").consume()
+        session.run("CALL db.awaitIndexes(600)").consume()
+
+        started = time.perf_counter()
+        session.run(f"""
+            UNWIND range(0, $people - 1) AS i
+            CALL {{
+                WITH i
+                CREATE (:Person {{ id: i, name: 'p' + i, age: i % 90, joined: date() }})
+            }} IN TRANSACTIONS OF {batch} ROWS
+        """, people=people).consume()
+        session.run(f"""
+            UNWIND range(0, $companies - 1) AS i
+            CALL {{
+                WITH i
+                CREATE (:Company {{ id: i, name: 'c' + i, revenue: toFloat(i) }})
+            }} IN TRANSACTIONS OF {batch} ROWS
+        """, companies=companies).consume()
+        session.run("""
+            UNWIND range(0, 99) AS i
+            CREATE (:City { id: i, name: 'city' + i })
+        """).consume()
+
+        # WORKS_AT: Person -> Company; KNOWS: Person -> Person (half each)
+        half = relationships // 2
+        session.run(f"""
+            UNWIND range(0, $n - 1) AS i
+            CALL {{
+                WITH i
+                MATCH (p:Person {{ id: i % $people }})
+                MATCH (c:Company {{ id: (i * 7919) % $companies }})
+                CREATE (p)-[:WORKS_AT {{ since: 2000 + i % 25 }}]->(c)
+            }} IN TRANSACTIONS OF {batch} ROWS
+        """, n=half, people=people, companies=companies).consume()
+        session.run(f"""
+            UNWIND range(0, $n - 1) AS i
+            CALL {{
+                WITH i
+                MATCH (a:Person {{ id: i % $people }})
+                MATCH (b:Person {{ id: (i * 104729 + 1) % $people }})
+                CREATE (a)-[:KNOWS]->(b)
+            }} IN TRANSACTIONS OF {batch} ROWS
+        """, n=relationships - half, people=people).consume()
+
+        print(f"[BENCH] Generated graph in {time.perf_counter() - started:.1f}s")
+
+
+# -----------------------------
+# Old extractor (unbounded scan)
+# -----------------------------
+def legacy_extract(driver, database):
+    schema = {}
+    with driver.session(database=database) as session:
+        labels = [r["label"] for r in session.run("CALL db.labels()")]
+        for label in labels:
+            props = [r["key"] for r in session.run(f"""
+                MATCH (n:`{label}`) WITH n LIMIT 50
+                UNWIND keys(n) AS key RETURN DISTINCT key
+            """)]
+            rels = [r.data() for r in session.run(f"""
+                MATCH (a:`{label}`)-[r]-(b)
+                RETURN DISTINCT type(r) AS type, labels(b)[0] AS target
+            """)]
+            schema[label] = {"properties": props, "relationships": rels}
+    return {"schema": schema}
+
+
+# -----------------------------
+# Runner
+# -----------------------------
+def timed(fn, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    return samples, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--uri", default="bolt://localhost:7687")
+    parser.add_argument("--user", default="neo4j")
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--database", default="schemabench")
+    parser.add_argument("--generate", action="store_true")
+    parser.add_argument("--relationships", type=int, default=10_000_000)
+    parser.add_argument("--people", type=int, default=1_000_000)
+    parser.add_argument("--companies", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=50_000)
+    parser.add_argument("--sample-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    driver = GraphDatabase.driver(args.uri, auth=(args.user, args.password))
+
+    if args.generate:
+        generate(driver, args.database, args.people, args.companies,
+                 args.relationships, args.batch)
+
+    with driver.session(database=args.database) as session:
+        count = session.run("MATCH ()-[r]->() RETURN count(r) AS c").single()["c"]
+    print(f"[BENCH] {count:,} relationships in '{args.database}'")
+
+    runs = {}
+    for name, mode, rel_properties in (
+        ("metadata", "metadata", False),
+        ("+relprops", "metadata", True),   # opt-in full relationship scan
+        ("sample", "sample", False),
+    ):
+        extractor = Neo4jSchemaExtractor1(
+            args.uri, args.user, args.password, args.database,
+            mode=mode, sample_size=args.sample_size, rel_properties=rel_properties,
+        )
+        try:
+            runs[name] = timed(extractor.extract, args.repeat)
+        finally:
+            extractor.close()
+
+    if not args.skip_legacy:
+        # one run is enough: it walks every relationship of every label
+        runs["legacy scan"] = timed(lambda: legacy_extract(driver, args.database), 1)
+
+    driver.close()
+
+    print(f"\n{'mode':<14}{'median s':>12}{'min s':>10}{'labels':>8}{'rel patterns':>14}")
+    for mode, (samples, result) in runs.items():
+        schema = result["schema"]
+        patterns = sum(len(v["relationships"]) for v in schema.values())
+        print(
+            f"{mode:<14}{statistics.median(samples):>12.3f}{min(samples):>10.3f}"
+            f"{len(schema):>8}{patterns:>14}"
+        )
+
+
+if __name__ == "__main__":
+    main()
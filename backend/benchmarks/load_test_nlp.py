@@ -0,0 +1,175 @@
+"""
+/nlp/ask load test: async pipeline vs. the sync one on the threadpool.
+
+    cd backend
+    python -m benchmarks.load_test_nlp --password ... --database neo4j
+
+Runs the FastAPI app in-process (httpx ASGI transport) against a local
+Neo4j. Groq is replaced by a stub that sleeps --llm-latency seconds per
+call (both the Cypher and the summary call), and the /nlp caches are
+disabled so every question runs the full pipeline. For each concurrency
+level, that many questions are sent at once --rounds times; p50 / p99
+latency and throughput are printed for:
+
+    async  POST /nlp/ask            (async def route, AsyncGraphDatabase)
+    sync   POST /bench/sync-ask     (def route -> service.ask_question)
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import types
+
+# stub LLM: no key, no rate limit, no similar-question model
+os.environ.setdefault("GROQ_API_KEY", "load-test")
+os.environ["GROQ_RPM"] = "0"
+os.environ["GROQ_TPM"] = "0"
+os.environ["NLP_SIMILAR_QUESTIONS"] = "0"
+
+import httpx  # noqa: E402
+
+from app.llm_gateway import LLMGateway  # noqa: E402
+from app.main import app  # noqa: E402
+from app.modules.nlp import query_cache  # noqa: E402
+from app.modules.nlp.router import AskRequest  # noqa: E402
+from app.modules.nlp.service import ask_question  # noqa: E402
+
+STUB_CYPHER = "MATCH (n)\nRETURN count(n) AS count"
+STUB_SUMMARY = ["The graph ", "has ", "some ", "nodes."]
+
+
+# -----------------------------
+# Stubbed Groq
+# -----------------------------
+def _message(text):
+    return types.SimpleNamespace(
+        choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=text))]
+    )
+
+
+def _chunk(text):
+    return types.SimpleNamespace(
+        choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=text))]
+    )
+
+
+class _AsyncChunks:
+    def __init__(self, parts):
+        self.parts = list(parts)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.parts:
+            raise StopAsyncIteration
+        return _chunk(self.parts.pop(0))
+
+
+def install_llm_stub(latency: float):
+    def complete(self, prompt=None, messages=None, stream=False, **kwargs):
+        time.sleep(latency)
+        if stream:
+            return iter([_chunk(t) for t in STUB_SUMMARY])
+        return _message(STUB_CYPHER)
+
+    async def acomplete(self, prompt=None, messages=None, stream=False, **kwargs):
+        await asyncio.sleep(latency)
+        if stream:
+            return _AsyncChunks(STUB_SUMMARY)
+        return _message(STUB_CYPHER)
+
+    LLMGateway.complete = complete
+    LLMGateway.acomplete = acomplete
+
+
+def disable_caches():
+    query_cache.CYPHER_CACHE.max_entries = 0
+    query_cache.RESULT_CACHE.max_entries = 0
+
+
+@app.post("/bench/sync-ask")
+def sync_ask(req: AskRequest):
+    return ask_question(req)
+
+
+# -----------------------------
+# Runner
+# -----------------------------
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_level(client, path, body, concurrency, rounds):
+    latencies = []
+    errors = 0
+
+    async def one(i):
+        nonlocal errors
+        payload = {**body, "question": f"{body['question']} #{i}"}
+        started = time.perf_counter()
+        resp = await client.post(path, json=payload)
+        latencies.append(time.perf_counter() - started)
+        if resp.status_code != 200:
+            errors += 1
+
+    started = time.perf_counter()
+    for r in range(rounds):
+        await asyncio.gather(*(one(r * concurrency + i) for i in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    return {
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+        "qps": len(latencies) / wall,
+        "errors": errors,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--uri", default="bolt://localhost:7687")
+    parser.add_argument("--user", default="neo4j")
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--database", default="neo4j")
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--levels", default="10,50,200")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--modes", default="async,sync")
+    args = parser.parse_args()
+
+    install_llm_stub(args.llm_latency)
+    disable_caches()
+
+    body = {
+        "neo4j_uri": args.uri,
+        "neo4j_user": args.user,
+        "neo4j_password": args.password,
+        "neo4j_database": args.database,
+        "question": "How many nodes are in the graph?",
+    }
+    paths = {"async": "/nlp/ask", "sync": "/bench/sync-ask"}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        # warm-up: routers, drivers, schema snapshot
+        for mode in args.modes.split(","):
+            resp = await client.post(paths[mode], json=body)
+            resp.raise_for_status()
+
+        print(f"LLM stub latency {args.llm_latency}s per call, {args.rounds} rounds per level\n")
+        print(f"{'mode':<7}{'concurrency':>12}{'p50 s':>9}{'p99 s':>9}{'q/s':>9}{'errors':>8}")
+        for mode in args.modes.split(","):
+            for level in (int(x) for x in args.levels.split(",")):
+                stats = await run_level(client, paths[mode], body, level, args.rounds)
+                print(
+                    f"{mode:<7}{level:>12}{stats['p50']:>9.3f}{stats['p99']:>9.3f}"
+                    f"{stats['qps']:>9.1f}{stats['errors']:>8}"
+                )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())